@@ -6,56 +6,149 @@ Display top N recommendations for each category (configurable via config.yaml).
 import pandas as pd
 import sys
 import os
-import yaml
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+import config_loader
+
+try:
+    from pyarrow import csv as pa_csv
+    import pyarrow.dataset as pa_ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+RECOMMENDATIONS_CSV = "data/processed/recommendations.csv"
+# Written by src/main.py alongside the CSV, partitioned by category
+RECOMMENDATIONS_PARQUET = "data/processed/recommendations.parquet"
+
+# Rows per chunk when streaming the CSV without pyarrow
+CHUNK_ROWS = 10_000
+
+# Only the columns rendered below are parsed
+DISPLAY_DTYPES = {
+    'category': str,
+    'rank': 'int64',
+    'fund_name': str,
+    'score': 'float64',
+    'returns_1y': 'float64',
+    'returns_3y': 'float64',
+    'returns_5y': 'float64',
+    'scheme_code': 'int64',
+}
+
 def load_config():
     """Load configuration to get number of recommendations."""
     config_path = "config/config.yaml"
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get('analysis', {}).get('top_recommendations_per_category', 5)
+        config = config_loader.load_config(config_path)
+        return config.get('analysis', {}).get('top_recommendations_per_category', 5)
     except:
         return 5  # Default
 
+def _iter_recommendation_chunks(recommendations_file, dtype):
+    """Stream the displayed columns of the recommendations CSV in chunks."""
+    if PYARROW_AVAILABLE:
+        # pyarrow's streaming reader parses multithreaded, one record batch at a time
+        convert_options = pa_csv.ConvertOptions(include_columns=list(dtype))
+        for batch in pa_csv.open_csv(recommendations_file, convert_options=convert_options):
+            yield batch.to_pandas().astype(dtype)
+    else:
+        yield from pd.read_csv(recommendations_file, usecols=list(dtype), dtype=dtype,
+                               chunksize=CHUNK_ROWS)
+
+def load_recommendations(recommendations_file, top_n):
+    """
+    Load the first top_n recommendations of each category.
+    Rows beyond top_n are dropped chunk by chunk, so peak memory scales with
+    the number of displayed rows rather than the file size. The CSV is written
+    sorted by (category, rank), so the first rows seen are the top ranked.
+    The category column is returned as a (sorted) categorical.
+    
+    Returns:
+        Tuple of (top recommendations DataFrame, total rows in the file)
+    """
+    header = pd.read_csv(recommendations_file, nrows=0).columns
+    dtype = {col: kind for col, kind in DISPLAY_DTYPES.items() if col in header}
+    
+    seen_per_category = {}
+    kept_chunks = []
+    total_rows = 0
+    
+    for chunk in _iter_recommendation_chunks(recommendations_file, dtype):
+        total_rows += len(chunk)
+        already_seen = chunk['category'].map(seen_per_category).fillna(0)
+        position = chunk.groupby('category', sort=False).cumcount() + already_seen
+        kept_chunks.append(chunk[position < top_n])
+        for category, count in chunk['category'].value_counts().items():
+            seen_per_category[category] = seen_per_category.get(category, 0) + count
+    
+    if not kept_chunks:
+        return pd.DataFrame(columns=list(dtype)), total_rows
+    
+    top_df = pd.concat(kept_chunks, ignore_index=True)
+    # Categorical codes give sorted categories for free and int comparisons when grouping
+    top_df['category'] = top_df['category'].astype('category')
+    return top_df, total_rows
+
+def load_recommendations_parquet(parquet_path, top_n):
+    """
+    Load the first top_n recommendations of each category from the
+    category-partitioned Parquet dataset. Only the displayed columns are read
+    and rows ranked beyond top_n are filtered out while scanning.
+    
+    Returns:
+        Tuple of (top recommendations DataFrame, total rows in the dataset)
+    """
+    dataset = pa_ds.dataset(parquet_path, format='parquet', partitioning='hive')
+    columns = [col for col in DISPLAY_DTYPES if col in dataset.schema.names]
+    
+    total_rows = dataset.count_rows()
+    table = dataset.to_table(columns=columns, filter=pa_ds.field('rank') <= top_n)
+    
+    top_df = table.to_pandas()
+    top_df['category'] = top_df['category'].astype(str)
+    top_df = (top_df.sort_values(['category', 'rank'], kind='stable')
+              .groupby('category', sort=False).head(top_n)
+              .reset_index(drop=True))
+    top_df['category'] = top_df['category'].astype('category')
+    return top_df, total_rows
+
 def show_recommendations():
     """Display top recommendations."""
-    recommendations_file = "data/processed/recommendations.csv"
+    use_parquet = PYARROW_AVAILABLE and os.path.isdir(RECOMMENDATIONS_PARQUET)
     
-    if not os.path.exists(recommendations_file):
+    if not use_parquet and not os.path.exists(RECOMMENDATIONS_CSV):
         print("Recommendations file not found. Run the analyzer first:")
         print("  python3 src/main.py --all")
         return
     
-    df = pd.read_csv(recommendations_file)
+    # Get number of recommendations from config
+    top_n = load_config()
+    
+    if use_parquet:
+        top_df, total_rows = load_recommendations_parquet(RECOMMENDATIONS_PARQUET, top_n)
+    else:
+        top_df, total_rows = load_recommendations(RECOMMENDATIONS_CSV, top_n)
     
-    if df.empty:
+    if total_rows == 0:
         print("No recommendations found.")
         return
     
-    # Get number of recommendations from config
-    top_n = load_config()
-    
     print("=" * 100)
     print(f"TOP {top_n} MUTUAL FUND RECOMMENDATIONS BY CATEGORY")
     print("=" * 100)
     print()
     
-    categories = df['category'].unique()
+    categories = top_df['category'].cat.categories
     
-    for category in sorted(categories):
-        cat_df = df[df['category'] == category].head(top_n)
-        
-        if cat_df.empty:
-            continue
-        
+    for category, cat_df in top_df.groupby('category', observed=True):
         print(f"\n{'='*100}")
         print(f"CATEGORY: {category.upper()}")
         print(f"{'='*100}")
         print()
         
-        for idx, (_, fund) in enumerate(cat_df.iterrows(), 1):
+        for idx, fund in enumerate(cat_df.to_dict('records'), 1):
             print(f"Rank {fund['rank']}: {fund['fund_name']}")
             print(f"  Score: {fund['score']:.2f}")
             print(f"  Returns - 1Y: {fund.get('returns_1y', 0):.2f}% | 3Y: {fund.get('returns_3y', 0):.2f}% | 5Y: {fund.get('returns_5y', 0):.2f}%")
@@ -64,9 +157,9 @@ def show_recommendations():
             print()
     
     print("=" * 100)
-    print(f"\nTotal recommendations: {len(df)}")
+    print(f"\nTotal recommendations: {total_rows}")
     print(f"Categories: {len(categories)}")
-    print("\nFull data saved to: data/processed/recommendations.csv")
+    print(f"\nFull data saved to: {RECOMMENDATIONS_CSV}")
 
 if __name__ == "__main__":
     show_recommendations()
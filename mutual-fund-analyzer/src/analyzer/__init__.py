@@ -8,5 +8,6 @@ from .performance_analyzer import PerformanceAnalyzer
 from .consistency_analyzer import ConsistencyAnalyzer
 from .benchmark_analyzer import BenchmarkAnalyzer
 from .base_analyzer import BaseAnalyzer
+from .fund_context import FundContext
 
-__all__ = ['PerformanceAnalyzer', 'ConsistencyAnalyzer', 'BenchmarkAnalyzer', 'BaseAnalyzer']
+__all__ = ['PerformanceAnalyzer', 'ConsistencyAnalyzer', 'BenchmarkAnalyzer', 'BaseAnalyzer', 'FundContext']
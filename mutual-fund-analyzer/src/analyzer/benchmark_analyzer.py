@@ -6,11 +6,34 @@ Calculates alpha, tracking error, and benchmark comparison metrics.
 
 import pandas as pd
 import numpy as np
+import re
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Optional
 import requests
 import time
 from datetime import datetime, timedelta
 from .base_analyzer import BaseAnalyzer
+from .nav_math import pct_returns, annualized_return
+from .fund_context import FundContext
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Category-based default benchmarks (read-only, built once at import)
+_CATEGORY_BENCHMARKS = MappingProxyType({
+    'largecap': 'NIFTY 50',
+    'midcap': 'NIFTY Midcap 100',
+    'smallcap': 'NIFTY Smallcap 100',
+    'index_funds': 'NIFTY 50',  # Default, but index funds have specific benchmarks
+    'elss': 'NIFTY 500',
+    'hybrid': 'NIFTY 50 Hybrid Composite Debt 50:50',
+    'debt': 'CRISIL Composite Bond Fund Index',
+    'sectoral': 'NIFTY 500',
+})
 
 
 class BenchmarkAnalyzer(BaseAnalyzer):
@@ -32,7 +55,6 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         """Initialize the benchmark analyzer."""
         super().__init__(config)
         self.risk_free_rate = self.config.get('risk_free_rate', 6.0)
-        self.benchmark_cache = {}  # Cache for benchmark data
     
     def get_required_columns(self) -> list:
         """Get required columns for benchmark analysis."""
@@ -55,9 +77,12 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         # This method can be extended for batch analysis
         return fund_data
     
-    def identify_benchmark(self, fund_name: str, category: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def identify_benchmark(fund_name: str, category: str) -> Optional[str]:
         """
         Identify benchmark for a fund based on name and category.
+        Results are memoized per (fund_name, category) across all instances.
         
         Args:
             fund_name: Name of the fund
@@ -66,26 +91,14 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         Returns:
             Benchmark name or None
         """
-        fund_name_lower = fund_name.lower()
-        
-        # Check fund name for benchmark indicators
-        for keyword, benchmark in self.BENCHMARK_MAPPING.items():
-            if keyword in fund_name_lower:
+        if fund_name:
+            # Check fund name for benchmark indicators (single scan over the name)
+            benchmark = _match_benchmark_keyword(fund_name.lower())
+            if benchmark is not None:
                 return benchmark
         
         # Category-based default benchmarks
-        category_benchmarks = {
-            'largecap': 'NIFTY 50',
-            'midcap': 'NIFTY Midcap 100',
-            'smallcap': 'NIFTY Smallcap 100',
-            'index_funds': 'NIFTY 50',  # Default, but index funds have specific benchmarks
-            'elss': 'NIFTY 500',
-            'hybrid': 'NIFTY 50 Hybrid Composite Debt 50:50',
-            'debt': 'CRISIL Composite Bond Fund Index',
-            'sectoral': 'NIFTY 500',
-        }
-        
-        return category_benchmarks.get(category, 'NIFTY 50')
+        return _CATEGORY_BENCHMARKS.get(category, 'NIFTY 50')
     
     def fetch_benchmark_data(self, benchmark_name: str, days: int = 3650) -> Optional[pd.DataFrame]:
         """
@@ -126,16 +139,19 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         if len(fund_returns) != len(benchmark_returns) or len(fund_returns) < 2:
             return 0.0
         
+        fund = np.ascontiguousarray(fund_returns, dtype=np.float64)
+        benchmark = np.ascontiguousarray(benchmark_returns, dtype=np.float64)
+        
         # Calculate excess returns
-        fund_excess = fund_returns - (risk_free_rate / 12)  # Monthly risk-free rate
-        benchmark_excess = benchmark_returns - (risk_free_rate / 12)
+        fund_excess = fund - (risk_free_rate / 12)  # Monthly risk-free rate
+        benchmark_excess = benchmark - (risk_free_rate / 12)
         
         # Alpha = Fund excess return - (Beta * Benchmark excess return)
         # For simplicity, if beta not available, use: Alpha = Fund return - Benchmark return
-        alpha_monthly = fund_excess.mean() - benchmark_excess.mean()
+        alpha_monthly = np.nanmean(fund_excess) - np.nanmean(benchmark_excess)
         alpha_annualized = alpha_monthly * 12
         
-        return alpha_annualized
+        return float(alpha_annualized)
     
     def calculate_tracking_error(self, fund_returns: pd.Series, benchmark_returns: pd.Series) -> float:
         """
@@ -152,15 +168,17 @@ class BenchmarkAnalyzer(BaseAnalyzer):
             return 0.0
         
         # Calculate difference between fund and benchmark returns
-        difference = fund_returns - benchmark_returns
+        difference = (np.ascontiguousarray(fund_returns, dtype=np.float64)
+                      - np.ascontiguousarray(benchmark_returns, dtype=np.float64))
         
         # Tracking error = standard deviation of difference (annualized)
-        tracking_error = difference.std() * np.sqrt(12)
+        tracking_error = np.nanstd(difference, ddof=1) * np.sqrt(12)
         
-        return tracking_error
+        return float(tracking_error)
     
     def calculate_benchmark_metrics(self, nav_history: pd.DataFrame, 
-                                   benchmark_name: Optional[str] = None) -> Dict[str, float]:
+                                   benchmark_name: Optional[str] = None,
+                                   ctx: Optional[FundContext] = None) -> Dict[str, float]:
         """
         Calculate benchmark comparison metrics.
         Note: Without benchmark data, calculates relative consistency metrics.
@@ -168,11 +186,14 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         Args:
             nav_history: DataFrame with date and nav columns
             benchmark_name: Optional benchmark name
+            ctx: Optional precomputed FundContext (reuses its returns)
             
         Returns:
             Dictionary with benchmark metrics
         """
-        if nav_history is None or nav_history.empty or 'nav' not in nav_history.columns:
+        no_history = ctx.empty if ctx is not None else (
+            nav_history is None or nav_history.empty or 'nav' not in nav_history.columns)
+        if no_history:
             return {
                 'alpha': 0.0,
                 'tracking_error': 0.0,
@@ -183,8 +204,11 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         # For now, without benchmark data, we calculate relative metrics
         # In production, would fetch benchmark data and calculate actual alpha/tracking error
         
-        nav_series = nav_history.sort_values('date')['nav']
-        returns = nav_series.pct_change().dropna() * 100
+        if ctx is not None:
+            returns = ctx.returns
+        else:
+            nav_series = nav_history.sort_values('date')['nav']
+            returns = pct_returns(nav_series.to_numpy(dtype=np.float64))
         
         if len(returns) < 12:
             return {
@@ -196,18 +220,18 @@ class BenchmarkAnalyzer(BaseAnalyzer):
         
         # Calculate annualized return as proxy for comparison
         # (In production, would compare against actual benchmark)
-        annualized_return = ((1 + returns/100).prod() ** (12/len(returns)) - 1) * 100
+        fund_annualized_return = annualized_return(returns, periods_per_year=12)
         
         return {
             'alpha': 0.0,  # Would be calculated with benchmark data
             'tracking_error': 0.0,  # Would be calculated with benchmark data
-            'benchmark_outperformance': annualized_return,  # Proxy metric
+            'benchmark_outperformance': fund_annualized_return,  # Proxy metric
             'benchmark_name': benchmark_name or 'N/A',
-            'fund_annualized_return': annualized_return
+            'fund_annualized_return': fund_annualized_return
         }
     
     def analyze_fund_benchmark(self, nav_history: pd.DataFrame, fund_name: str, 
-                              category: str) -> Dict[str, float]:
+                              category: str, ctx: Optional[FundContext] = None) -> Dict[str, float]:
         """
         Analyze fund against its benchmark.
         
@@ -215,12 +239,62 @@ class BenchmarkAnalyzer(BaseAnalyzer):
             nav_history: DataFrame with date and nav columns
             fund_name: Fund name
             category: Fund category
+            ctx: Optional precomputed FundContext for the fund
             
         Returns:
             Dictionary with benchmark analysis metrics
         """
         benchmark_name = self.identify_benchmark(fund_name, category)
-        metrics = self.calculate_benchmark_metrics(nav_history, benchmark_name)
+        metrics = self.calculate_benchmark_metrics(nav_history, benchmark_name, ctx=ctx)
         
         return metrics
 
+
+def _build_benchmark_matcher(mapping: Dict[str, str]):
+    """
+    Compile benchmark keywords into a matcher that scans a fund name once.
+    Each keyword carries its position in the mapping so the earliest listed
+    keyword found anywhere in the name still wins, as with a sequential scan.
+    
+    Args:
+        mapping: Keyword to benchmark mapping (insertion order = priority)
+        
+    Returns:
+        Aho-Corasick automaton, or a compiled regex when pyahocorasick is missing
+    """
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for priority, (keyword, benchmark) in enumerate(mapping.items()):
+            automaton.add_word(keyword, (priority, benchmark))
+        automaton.make_automaton()
+        return automaton
+    
+    # Zero-width lookahead reports a match at every position, so overlapping
+    # keywords (e.g. 'nifty' inside 'nifty midcap') are all seen
+    alternation = '|'.join(re.escape(keyword) for keyword in mapping)
+    return re.compile(f'(?=({alternation}))')
+
+
+def _match_benchmark_keyword(text: str) -> Optional[str]:
+    """Return the benchmark of the highest-priority keyword contained in text."""
+    if AHOCORASICK_AVAILABLE:
+        matches = (value for _, value in _BENCHMARK_MATCHER.iter(text))
+    else:
+        matches = (_BENCHMARK_PRIORITY[m.group(1)] for m in _BENCHMARK_MATCHER.finditer(text))
+    
+    best = None
+    for priority, benchmark in matches:
+        if best is None or priority < best[0]:
+            best = (priority, benchmark)
+            if priority == 0:
+                break
+    
+    return best[1] if best else None
+
+
+_BENCHMARK_MATCHER = _build_benchmark_matcher(BenchmarkAnalyzer.BENCHMARK_MAPPING)
+_BENCHMARK_PRIORITY = {
+    keyword: (priority, benchmark)
+    for priority, (keyword, benchmark) in enumerate(BenchmarkAnalyzer.BENCHMARK_MAPPING.items())
+}
+
@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 from .base_analyzer import BaseAnalyzer
+from .nav_math import pct_returns, coefficient_of_variation
+from .fund_context import FundContext
 
 
 class ConsistencyAnalyzer(BaseAnalyzer):
@@ -39,84 +41,100 @@ class ConsistencyAnalyzer(BaseAnalyzer):
         # This method can be extended for additional consistency analysis
         return fund_data
     
-    def calculate_consistency_score(self, nav_data: pd.Series) -> float:
+    def calculate_consistency_score(self, nav_data: pd.Series,
+                                    returns: Optional[np.ndarray] = None) -> float:
         """
         Calculate consistency score based on rolling returns.
         Higher score = more consistent performance.
         
         Args:
             nav_data: Series of NAV values over time
+            returns: Optional pre-computed percentage returns (skips re-deriving from nav_data)
             
         Returns:
             Consistency score (0-100)
         """
-        if nav_data is None or len(nav_data) < 12:
-            return 0.0
-        
-        # Calculate monthly returns
-        returns = nav_data.pct_change().dropna() * 100
+        if returns is None:
+            if nav_data is None or len(nav_data) < 12:
+                return 0.0
+            
+            # Calculate monthly returns
+            returns = pct_returns(nav_data)
         
         if len(returns) < 12:
             return 0.0
         
+        return self._score_from_stats(returns.mean(), returns.std(ddof=1))
+    
+    def _score_from_stats(self, mean_return: float, std_return: float) -> float:
+        """
+        Convert return mean/std into a consistency score.
+        
+        Args:
+            mean_return: Mean of percentage returns
+            std_return: Standard deviation of percentage returns
+            
+        Returns:
+            Consistency score (0-100)
+        """
         # Calculate coefficient of variation (lower = more consistent)
         # Inverse relationship: lower CV = higher consistency score
-        mean_return = returns.mean()
-        std_return = returns.std()
-        
-        if mean_return == 0:
-            return 0.0
-        
-        coefficient_of_variation = abs(std_return / mean_return) if mean_return != 0 else 100
+        # A zero mean gives CV 100, which maps to a score of 0
+        cv = coefficient_of_variation(mean_return, std_return)
         
         # Convert to score (0-100): lower CV = higher score
         # CV of 0.5 = very consistent, CV of 2.0+ = inconsistent
-        consistency_score = max(0, 100 - (coefficient_of_variation * 50))
-        
-        return min(consistency_score, 100.0)
+        return float(_score_from_cv(cv, 50))
     
-    def calculate_rolling_returns_consistency(self, nav_data: pd.Series, window_months: int = 12) -> float:
+    def calculate_rolling_returns_consistency(self, nav_data: pd.Series, window_months: int = 12,
+                                              returns: Optional[np.ndarray] = None,
+                                              log_returns_cumsum: Optional[np.ndarray] = None) -> float:
         """
         Calculate consistency of rolling returns.
         
         Args:
             nav_data: Series of NAV values
             window_months: Rolling window size in months
+            returns: Optional pre-computed percentage returns (skips re-deriving from nav_data)
+            log_returns_cumsum: Optional cumulative sum of log(1 + return) for those
+                returns (see FundContext); window sums become differences of it
             
         Returns:
             Consistency score based on rolling returns variance
         """
-        if nav_data is None or len(nav_data) < window_months * 2:
+        if returns is None:
+            if nav_data is None or len(nav_data) < window_months * 2:
+                return 0.0
+            
+            # Calculate monthly returns
+            returns = pct_returns(nav_data)
+        elif len(returns) + 1 < window_months * 2:
             return 0.0
         
-        # Calculate monthly returns
-        monthly_returns = nav_data.pct_change().dropna() * 100
-        
-        if len(monthly_returns) < window_months:
+        if len(returns) < window_months:
             return 0.0
         
         # Calculate rolling annualized returns
-        rolling_returns = monthly_returns.rolling(window=window_months).apply(
-            lambda x: ((1 + x/100).prod() - 1) * 100 * (12 / len(x)) if len(x) == window_months else np.nan
-        ).dropna()
+        # Compounding via a rolling sum of log returns runs in pandas' C kernels
+        # instead of invoking a Python callback per window
+        if log_returns_cumsum is not None and np.isfinite(log_returns_cumsum[-1]):
+            # Window sum = difference of the running sum (finite, so no NaN/inf to propagate)
+            rolling_log_sum = log_returns_cumsum[window_months - 1:] - np.concatenate(
+                ([0.0], log_returns_cumsum[:-window_months]))
+        else:
+            log_returns = np.log1p(np.asarray(returns) / 100)
+            rolling_log_sum = pd.Series(log_returns).rolling(window=window_months).sum().dropna().to_numpy()
+        rolling_returns = np.expm1(rolling_log_sum) * (12 / window_months) * 100
         
         if len(rolling_returns) < 2:
             return 0.0
         
         # Lower variance in rolling returns = higher consistency
-        variance = rolling_returns.var()
-        mean_return = abs(rolling_returns.mean())
-        
-        if mean_return == 0:
-            return 0.0
-        
         # Coefficient of variation of rolling returns
-        cv = np.sqrt(variance) / mean_return if mean_return > 0 else 100
+        cv = coefficient_of_variation(rolling_returns.mean(), np.sqrt(rolling_returns.var(ddof=1)))
         
         # Convert to score: lower CV = higher consistency
-        consistency_score = max(0, 100 - (cv * 30))
-        
-        return min(consistency_score, 100.0)
+        return float(_score_from_cv(cv, 30))
     
     def calculate_quartile_consistency(self, returns_series: pd.Series) -> float:
         """
@@ -136,24 +154,26 @@ class ConsistencyAnalyzer(BaseAnalyzer):
         mean_return = returns_series.mean()
         std_return = returns_series.std()
         
-        if mean_return == 0:
-            return 0.0
+        cv = coefficient_of_variation(mean_return, std_return)
         
-        cv = abs(std_return / mean_return) if mean_return != 0 else 100
-        consistency_score = max(0, 100 - (cv * 50))
-        
-        return min(consistency_score, 100.0)
+        return float(_score_from_cv(cv, 50))
     
-    def analyze_fund_consistency(self, nav_history: pd.DataFrame) -> Dict[str, float]:
+    def analyze_fund_consistency(self, nav_history: pd.DataFrame,
+                                 ctx: Optional[FundContext] = None) -> Dict[str, float]:
         """
         Analyze consistency metrics for a fund.
+        Thin wrapper over analyze_funds_consistency for a single fund.
         
         Args:
             nav_history: DataFrame with date and nav columns
+            ctx: Optional precomputed FundContext (reuses its returns and stats)
             
         Returns:
             Dictionary with consistency metrics
         """
+        if ctx is not None:
+            return self._consistency_from_context(ctx)
+        
         if nav_history is None or nav_history.empty or 'nav' not in nav_history.columns:
             return {
                 'consistency_score': 0.0,
@@ -161,24 +181,117 @@ class ConsistencyAnalyzer(BaseAnalyzer):
                 'coefficient_of_variation': 100.0
             }
         
-        nav_series = nav_history.sort_values('date')['nav']
+        metrics = self.analyze_funds_consistency(nav_history.assign(fund_id=0))
+        row = metrics.iloc[0]
         
-        # Calculate consistency score
-        consistency_score = self.calculate_consistency_score(nav_series)
-        rolling_consistency = self.calculate_rolling_returns_consistency(nav_series)
+        return {
+            'consistency_score': float(row['consistency_score']),
+            'rolling_consistency': float(row['rolling_consistency']),
+            'coefficient_of_variation': float(row['coefficient_of_variation'])
+        }
+    
+    def _consistency_from_context(self, ctx: FundContext) -> Dict[str, float]:
+        """
+        Consistency metrics from a FundContext's precomputed returns/stats.
         
-        # Calculate coefficient of variation
-        returns = nav_series.pct_change().dropna() * 100
-        if len(returns) > 0:
-            mean_return = returns.mean()
-            std_return = returns.std()
-            cv = abs(std_return / mean_return) if mean_return != 0 else 100.0
-        else:
+        Args:
+            ctx: FundContext for the fund
+            
+        Returns:
+            Dictionary with consistency metrics
+        """
+        returns = ctx.returns
+        if len(returns) == 0:
             cv = 100.0
+        else:
+            cv = coefficient_of_variation(ctx.mean_return, ctx.std_return)
+        
+        consistency_score = 0.0
+        if len(returns) >= 12:
+            consistency_score = self._score_from_stats(ctx.mean_return, ctx.std_return)
+        rolling_consistency = self.calculate_rolling_returns_consistency(
+            None, returns=returns, log_returns_cumsum=ctx.log_returns_cumsum)
         
         return {
             'consistency_score': consistency_score,
             'rolling_consistency': rolling_consistency,
             'coefficient_of_variation': cv
         }
+    
+    def analyze_funds_consistency(self, nav_history: pd.DataFrame,
+                                  window_months: int = 12) -> pd.DataFrame:
+        """
+        Analyze consistency metrics for many funds in one pass.
+        All statistics are computed with grouped pandas operations instead of
+        a Python call per fund.
+        
+        Args:
+            nav_history: Long DataFrame with fund_id, date and nav columns
+            window_months: Rolling window size in months
+            
+        Returns:
+            DataFrame indexed by fund_id with consistency_score,
+            rolling_consistency and coefficient_of_variation columns
+        """
+        # Sort once; returns are then derived within each fund
+        df = nav_history.sort_values(['fund_id', 'date'], kind='stable')
+        fund_ids = df['fund_id'].unique()
+        nav = pd.to_numeric(df['nav'], errors='coerce').astype(np.float64)
+        
+        returns = nav.groupby(df['fund_id'], sort=False).pct_change() * 100
+        valid = returns.notna()
+        returns = returns[valid]
+        fund_keys = df['fund_id'][valid]
+        
+        stats = returns.groupby(fund_keys).agg(['mean', 'std', 'count'])
+        stats = stats.reindex(fund_ids)
+        stats['count'] = stats['count'].fillna(0)
+        mean_return = stats['mean']
+        
+        # CV of period returns; 100 when there is no usable mean
+        cv = pd.Series(coefficient_of_variation(mean_return, stats['std']), index=stats.index)
+        cv = cv.mask(stats['count'] == 0, 100.0)
+        
+        consistency_score = pd.Series(_score_from_cv(cv, 50), index=stats.index)
+        consistency_score = consistency_score.where(stats['count'] >= 12, 0.0)
+        
+        # Rolling annualized returns from per-fund rolling sums of log returns
+        log_returns = pd.Series(np.log1p(returns.to_numpy() / 100), index=returns.index)
+        rolling_log_sum = (log_returns.groupby(fund_keys)
+                           .rolling(window=window_months).sum()
+                           .dropna())
+        rolling_keys = rolling_log_sum.index.get_level_values(0)
+        rolling_returns = pd.Series(np.expm1(rolling_log_sum.to_numpy()) * (12 / window_months) * 100)
+        rolling_stats = rolling_returns.groupby(rolling_keys.to_numpy()).agg(['var', 'mean', 'count'])
+        rolling_stats = rolling_stats.reindex(fund_ids)
+        
+        rolling_cv = coefficient_of_variation(rolling_stats['mean'], np.sqrt(rolling_stats['var']))
+        rolling_consistency = pd.Series(_score_from_cv(rolling_cv, 30), index=stats.index)
+        rolling_consistency = rolling_consistency.where(
+            (stats['count'] + 1 >= window_months * 2) & (rolling_stats['count'] >= 2),
+            0.0
+        )
+        
+        result = pd.DataFrame({
+            'consistency_score': consistency_score,
+            'rolling_consistency': rolling_consistency,
+            'coefficient_of_variation': cv
+        })
+        result.index.name = 'fund_id'
+        return result
+
+
+def _score_from_cv(cv, weight: float):
+    """
+    Map coefficient(s) of variation to a 0-100 consistency score.
+    Lower CV = higher score; NaN CVs score 0.
+    
+    Args:
+        cv: Coefficient of variation (scalar or array)
+        weight: Score points lost per unit of CV
+        
+    Returns:
+        Consistency score(s) clipped to 0-100
+    """
+    return np.nan_to_num(np.clip(100 - np.asarray(cv) * weight, 0, 100), nan=0.0)
 
@@ -0,0 +1,58 @@
+"""
+Fund Context
+Per-fund NAV arrays and return statistics computed once and shared by all analyzers.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from typing import Optional
+from .nav_math import pct_returns
+
+
+@dataclass(frozen=True)
+class FundContext:
+    """Date-sorted NAV history of one fund with precomputed return statistics."""
+    
+    nav: np.ndarray                 # NAV values sorted by date
+    returns: np.ndarray             # Period percentage returns (NaN dropped)
+    mean_return: float              # Mean of returns (NaN if no returns)
+    std_return: float               # Sample std of returns, ddof=1 (NaN if < 2 returns)
+    log_returns_cumsum: np.ndarray  # Cumulative sum of log(1 + return)
+    
+    @classmethod
+    def from_nav(cls, nav_history: Optional[pd.DataFrame]) -> 'FundContext':
+        """
+        Build the context with a single sort and a single pass over the NAV.
+        
+        Args:
+            nav_history: DataFrame with date and nav columns
+        
+        Returns:
+            FundContext (empty arrays when there is no NAV history)
+        """
+        if nav_history is None or nav_history.empty or 'nav' not in nav_history.columns:
+            nav = np.empty(0, dtype=np.float64)
+        else:
+            if 'date' in nav_history.columns:
+                nav_history = nav_history.sort_values('date')
+            nav = nav_history['nav'].to_numpy(dtype=np.float64)
+        
+        returns = pct_returns(nav)
+        mean_return = returns.mean() if returns.size > 0 else np.nan
+        std_return = returns.std(ddof=1) if returns.size > 1 else np.nan
+        log_returns_cumsum = np.cumsum(np.log1p(returns / 100))
+        
+        return cls(
+            nav=nav,
+            returns=returns,
+            mean_return=float(mean_return),
+            std_return=float(std_return),
+            log_returns_cumsum=log_returns_cumsum,
+        )
+    
+    @property
+    def empty(self) -> bool:
+        """Whether the fund has no NAV history."""
+        return self.nav.size == 0
+
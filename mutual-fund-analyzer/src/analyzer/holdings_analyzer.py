@@ -1,11 +1,23 @@
 """
 Holdings Analyzer
 Analyzes current stock holdings in mutual funds.
+Holdings are expected as DataFrames (built once at ingestion); lists of
+holding dictionaries are still accepted and converted on entry.
 """
 
 import pandas as pd
-from typing import Dict, List
-from collections import Counter
+import numpy as np
+from typing import Dict, List, Union
+
+# One fund's holdings: DataFrame with 'stock_name'/'weight' columns, or list of dicts
+HoldingsData = Union[pd.DataFrame, List[Dict]]
+
+
+def _to_holdings_df(holdings_data: HoldingsData) -> pd.DataFrame:
+    """Return holdings as a DataFrame, converting list-of-dict input once."""
+    if isinstance(holdings_data, pd.DataFrame):
+        return holdings_data
+    return pd.DataFrame(holdings_data or [])
 
 
 class HoldingsAnalyzer:
@@ -15,43 +27,47 @@ class HoldingsAnalyzer:
         """Initialize the holdings analyzer."""
         pass
     
-    def get_top_holdings(self, holdings_data: List[Dict], top_n: int = 10) -> pd.DataFrame:
+    def get_top_holdings(self, holdings_data: HoldingsData, top_n: int = 10) -> pd.DataFrame:
         """
         Get top N holdings from a fund.
         
         Args:
-            holdings_data: List of holding dictionaries with 'stock_name' and 'weight'
+            holdings_data: Holdings DataFrame (or list of dicts) with 'stock_name' and 'weight'
             top_n: Number of top holdings to return
             
         Returns:
             DataFrame with top holdings
         """
-        if not holdings_data:
+        df = _to_holdings_df(holdings_data)
+        if df.empty:
             return pd.DataFrame()
         
-        df = pd.DataFrame(holdings_data)
         df_sorted = df.sort_values('weight', ascending=False).head(top_n)
         
         return df_sorted
     
-    def analyze_holdings_composition(self, holdings_data: List[Dict]) -> Dict:
+    def analyze_holdings_composition(self, holdings_data: HoldingsData) -> Dict:
         """
         Analyze the composition of fund holdings.
         
         Args:
-            holdings_data: List of holding dictionaries
+            holdings_data: Holdings DataFrame (or list of dicts)
             
         Returns:
             Dictionary with composition analysis
         """
-        if not holdings_data:
+        df = _to_holdings_df(holdings_data)
+        if df.empty:
             return {}
         
-        df = pd.DataFrame(holdings_data)
+        # Quickselect the 10 largest weights instead of sorting (NaN weights skipped, as pandas did)
+        weights = df['weight'].to_numpy(dtype=np.float64)
+        weights = weights[~np.isnan(weights)]
+        top_10_weight = weights.sum() if weights.size < 10 else np.partition(weights, -10)[-10:].sum()
         
         analysis = {
             'total_holdings': len(df),
-            'top_10_weight': df.nlargest(10, 'weight')['weight'].sum() if len(df) >= 10 else df['weight'].sum(),
+            'top_10_weight': float(top_10_weight),
             'concentration_risk': self._calculate_concentration_risk(df),
         }
         
@@ -73,12 +89,12 @@ class HoldingsAnalyzer:
         if 'weight' not in holdings_df.columns or len(holdings_df) == 0:
             return 0.0
         
-        weights = holdings_df['weight'] / 100  # Convert percentage to decimal
-        hhi = (weights ** 2).sum() * 10000  # Scale to 0-10000
+        weights = holdings_df['weight'].to_numpy(dtype=np.float64) / 100  # Convert percentage to decimal
+        hhi = np.nansum(np.square(weights)) * 10000  # Scale to 0-10000
         
-        return hhi
+        return float(hhi)
     
-    def analyze_top_10_holdings(self, fund_holdings: Dict[str, List[Dict]]) -> pd.DataFrame:
+    def analyze_top_10_holdings(self, fund_holdings: Dict[str, HoldingsData]) -> pd.DataFrame:
         """
         Analyze top 10 holdings across multiple funds.
         
@@ -93,8 +109,7 @@ class HoldingsAnalyzer:
         for fund_name, holdings in fund_holdings.items():
             top_10 = self.get_top_holdings(holdings, top_n=10)
             if not top_10.empty:
-                top_10['fund_name'] = fund_name
-                all_top_holdings.append(top_10)
+                all_top_holdings.append(top_10.assign(fund_name=fund_name))
         
         if not all_top_holdings:
             return pd.DataFrame()
@@ -102,28 +117,37 @@ class HoldingsAnalyzer:
         combined_df = pd.concat(all_top_holdings, ignore_index=True)
         return combined_df
     
-    def find_common_holdings(self, funds_holdings: Dict[str, List[Dict]], min_funds: int = 2) -> List[str]:
+    def find_common_holdings(self, funds_holdings: Union[pd.DataFrame, Dict[str, HoldingsData]],
+                             min_funds: int = 2) -> List[str]:
         """
         Find stocks that are held by multiple funds.
         
         Args:
-            funds_holdings: Dictionary mapping fund names to their holdings
+            funds_holdings: Long DataFrame of (fund_name, stock_name) rows, or a
+                dictionary mapping fund names to their holdings
             min_funds: Minimum number of funds that should hold a stock
             
         Returns:
             List of common stock names
         """
-        stock_fund_count = Counter()
-        
-        for fund_name, holdings in funds_holdings.items():
-            if holdings:
-                stocks = [h.get('stock_name') for h in holdings if h.get('stock_name')]
-                stock_fund_count.update(stocks)
-        
-        common_stocks = [
-            stock for stock, count in stock_fund_count.items()
-            if count >= min_funds
-        ]
+        if isinstance(funds_holdings, pd.DataFrame):
+            stock_names = funds_holdings.get('stock_name', pd.Series(dtype=object))
+        else:
+            name_columns = []
+            for holdings in funds_holdings.values():
+                if isinstance(holdings, pd.DataFrame):
+                    if 'stock_name' in holdings.columns:
+                        name_columns.append(holdings['stock_name'])
+                elif holdings:
+                    name_columns.append(pd.Series([h.get('stock_name') for h in holdings], dtype=object))
+            stock_names = (pd.concat(name_columns, ignore_index=True) if name_columns
+                           else pd.Series(dtype=object))
+        
+        stock_names = stock_names[stock_names.notna() & (stock_names != '')]
+        
+        # Hash-count in pandas' C layer; sort=False keeps first-seen order
+        stock_fund_count = stock_names.value_counts(sort=False)
+        common_stocks = stock_fund_count.index[stock_fund_count >= min_funds].tolist()
         
         return common_stocks
 
@@ -0,0 +1,174 @@
+"""
+NAV Math
+Shared numeric helpers operating on raw NAV/return arrays.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Union
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def pct_returns(nav_data: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Calculate period-over-period percentage returns in a single pass.
+    Equivalent to nav_data.pct_change().dropna() * 100.
+    
+    Args:
+        nav_data: NAV values ordered by date
+        
+    Returns:
+        Array of percentage returns (NaN entries dropped)
+    """
+    nav = np.asarray(nav_data, dtype=np.float64)
+    if nav.size < 2:
+        return np.empty(0, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(nav) / nav[:-1] * 100
+    return returns[~np.isnan(returns)]
+
+
+def annualized_return(returns_pct: Union[pd.Series, np.ndarray], periods_per_year: int = 12) -> float:
+    """
+    Calculate the compound annualized return of a series of period returns.
+    Sums log returns instead of multiplying growth factors, which stays
+    numerically stable for long NAV histories.
+    
+    Args:
+        returns_pct: Period percentage returns
+        periods_per_year: Number of return periods per year (12 = monthly)
+        
+    Returns:
+        Annualized return percentage (0.0 when there are no returns)
+    """
+    returns = np.asarray(returns_pct, dtype=np.float64)
+    if returns.size == 0:
+        return 0.0
+    
+    log_growth = np.log1p(returns / 100).sum()
+    return float(np.expm1(log_growth * periods_per_year / returns.size) * 100)
+
+
+def coefficient_of_variation(mean_return, std_return, default: float = 100.0):
+    """
+    Calculate |std / mean| without branching on the mean.
+    Works element-wise for arrays/Series as well as for scalars.
+    
+    Args:
+        mean_return: Mean return(s)
+        std_return: Standard deviation(s) of returns
+        default: Value used where the mean is zero
+        
+    Returns:
+        Coefficient of variation (float for scalar input, ndarray otherwise)
+    """
+    mean = np.asarray(mean_return, dtype=np.float64)
+    std = np.asarray(std_return, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.where(mean != 0, np.abs(std / mean), default)
+    return float(cv) if cv.ndim == 0 else cv
+
+
+def _max_drawdown_loop(nav: np.ndarray) -> float:
+    """
+    Single pass over NAV tracking the running peak and deepest drawdown.
+    NaN drawdowns (NaN NAVs, zero peaks) are skipped; NaN if none is valid.
+    """
+    peak = -np.inf
+    max_dd = 0.0
+    any_valid = False
+    for value in nav:
+        if value > peak:
+            peak = value
+        drawdown = (value - peak) / peak
+        if not np.isnan(drawdown):
+            any_valid = True
+            if drawdown < max_dd:
+                max_dd = drawdown
+    if not any_valid:
+        return np.nan
+    return -max_dd * 100.0 if max_dd < 0 else 0.0
+
+
+if NUMBA_AVAILABLE:
+    # cache=True persists the compiled kernel so the JIT cost is paid once;
+    # error_model='numpy': a zero peak gives NaN like the NumPy path instead of raising
+    _max_drawdown_kernel = njit(cache=True, error_model='numpy')(_max_drawdown_loop)
+
+
+def _welford_loop(values: np.ndarray):
+    """Single pass count/mean/sum of squared deviations, skipping NaN (Welford)."""
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in values:
+        if np.isnan(value):
+            continue
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    return count, mean, m2
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: it would let the compiler assume NaN never occurs
+    _welford_kernel = njit(cache=True, nogil=True)(_welford_loop)
+
+
+def mean_std(values: Union[pd.Series, np.ndarray]):
+    """
+    Calculate count, mean and sample standard deviation in one pass.
+    NaN values are skipped, as pandas does.
+    
+    Args:
+        values: Return values
+        
+    Returns:
+        Tuple of (count, mean, std with ddof=1); mean/std are NaN when undefined
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        count, mean, m2 = _welford_kernel(values)
+    else:
+        valid = values[~np.isnan(values)]
+        count = valid.size
+        mean = valid.mean() if count else 0.0
+        m2 = np.square(valid - mean).sum() if count else 0.0
+    
+    if count == 0:
+        return 0, np.nan, np.nan
+    std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+    return int(count), float(mean), float(std)
+
+
+def max_drawdown(nav_data: Union[pd.Series, np.ndarray]) -> float:
+    """
+    Calculate maximum drawdown.
+    
+    Args:
+        nav_data: NAV values ordered by date
+        
+    Returns:
+        Maximum drawdown percentage (positive number; NaN when no NAV is valid)
+    """
+    nav = np.ascontiguousarray(nav_data, dtype=np.float64)
+    if nav.size == 0:
+        return 0.0
+    
+    if NUMBA_AVAILABLE:
+        return float(_max_drawdown_kernel(nav))
+    
+    # Running peak as a ufunc accumulate; fmax skips NaN like pandas' expanding max
+    peak = np.fmax.accumulate(nav)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (nav - peak) / peak * 100
+    drawdown = drawdown[~np.isnan(drawdown)]
+    return float(abs(drawdown.min())) if drawdown.size else np.nan
@@ -6,8 +6,10 @@ Extends BaseAnalyzer for modularity.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base_analyzer import BaseAnalyzer
+from .nav_math import max_drawdown, mean_std
+from .fund_context import FundContext
 
 
 class PerformanceAnalyzer(BaseAnalyzer):
@@ -39,48 +41,63 @@ class PerformanceAnalyzer(BaseAnalyzer):
         # This method can be extended for additional analysis
         return fund_data
     
-    def calculate_returns(self, nav_data: pd.Series, periods: List[int] = [1, 3, 5, 10]) -> Dict[str, float]:
+    def calculate_returns(self, nav_data: pd.Series, periods: List[int] = [1, 3, 5, 10],
+                          ctx: Optional[FundContext] = None) -> Dict[str, float]:
         """
         Calculate returns for different periods.
         
         Args:
             nav_data: Series of NAV values over time
             periods: List of periods in years
+            ctx: Optional precomputed FundContext (uses its sorted NAV array)
             
         Returns:
             Dictionary with returns for each period
         """
-        returns = {}
+        returns = {f'returns_{period}y': None for period in periods}
         
+        # Index the raw array once instead of going through .iloc per period
+        nav = ctx.nav if ctx is not None else np.asarray(nav_data, dtype=np.float64)
+        n = nav.size
+        if not periods or n <= min(periods) * 12:  # Assuming monthly data
+            return returns
+        
+        end_nav = nav[-1]
         for period in periods:
-            if len(nav_data) > period * 12:  # Assuming monthly data
-                start_nav = nav_data.iloc[-(period * 12)]
-                end_nav = nav_data.iloc[-1]
-                returns[f'returns_{period}y'] = ((end_nav / start_nav) - 1) * 100
-            else:
-                returns[f'returns_{period}y'] = None
+            idx = period * 12
+            if n > idx:
+                returns[f'returns_{period}y'] = ((end_nav / nav[-idx]) - 1) * 100
         
         return returns
     
-    def calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = None) -> float:
+    def calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = None,
+                               ctx: Optional[FundContext] = None) -> float:
         """
         Calculate Sharpe ratio.
         
         Args:
-            returns: Series of returns
+            returns: Series of returns (ignored when ctx is given)
             risk_free_rate: Risk-free rate (defaults to config value)
+            ctx: Optional precomputed FundContext (uses its return mean/std)
             
         Returns:
             Sharpe ratio
         """
         if risk_free_rate is None:
             risk_free_rate = self.risk_free_rate
+        
+        if ctx is not None:
+            if len(ctx.returns) == 0 or ctx.std_return == 0:
+                return 0.0
+            return (ctx.mean_return - risk_free_rate / 12) / ctx.std_return * np.sqrt(12)
             
-        if len(returns) == 0 or returns.std() == 0:
+        # Mean and std in a single (JIT-compiled when available) pass
+        count, mean_return, std_return = mean_std(returns)
+        if count == 0 or std_return == 0:
             return 0.0
         
-        excess_returns = returns - (risk_free_rate / 12)  # Monthly risk-free rate
-        sharpe = (excess_returns.mean() / returns.std()) * np.sqrt(12)  # Annualized
+        excess_mean = mean_return - (risk_free_rate / 12)  # Monthly risk-free rate
+        sharpe = (excess_mean / std_return) * np.sqrt(12)  # Annualized
         return sharpe
     
     def calculate_sortino_ratio(self, returns: pd.Series, risk_free_rate: float = None) -> float:
@@ -100,13 +117,14 @@ class PerformanceAnalyzer(BaseAnalyzer):
         if len(returns) == 0:
             return 0.0
         
-        excess_returns = returns - (risk_free_rate / 12)
-        downside_returns = returns[returns < 0]
+        values = np.ascontiguousarray(returns, dtype=np.float64)
+        _, mean_return, _ = mean_std(values)
+        downside_count, _, downside_std = mean_std(values[values < 0])
         
-        if len(downside_returns) == 0 or downside_returns.std() == 0:
+        if downside_count == 0 or downside_std == 0:
             return 0.0
         
-        sortino = (excess_returns.mean() / downside_returns.std()) * np.sqrt(12)
+        sortino = ((mean_return - risk_free_rate / 12) / downside_std) * np.sqrt(12)
         return sortino
     
     def calculate_beta(self, fund_returns: pd.Series, benchmark_returns: pd.Series) -> float:
@@ -120,36 +138,42 @@ class PerformanceAnalyzer(BaseAnalyzer):
         Returns:
             Beta value
         """
-        if len(fund_returns) != len(benchmark_returns) or len(fund_returns) == 0:
+        if len(fund_returns) != len(benchmark_returns) or len(fund_returns) < 2:
             return 1.0
         
-        covariance = np.cov(fund_returns, benchmark_returns)[0][1]
-        benchmark_variance = np.var(benchmark_returns)
+        fund = np.ascontiguousarray(fund_returns, dtype=np.float64)
+        benchmark = np.ascontiguousarray(benchmark_returns, dtype=np.float64)
+        
+        # Cov/var via dot products on demeaned arrays; the shared 1/(n-1)
+        # factor cancels, so no 2x2 covariance matrix is built
+        fund_dev = fund - fund.mean()
+        benchmark_dev = benchmark - benchmark.mean()
+        benchmark_variance = benchmark_dev @ benchmark_dev
         
         if benchmark_variance == 0:
             return 1.0
         
-        beta = covariance / benchmark_variance
-        return beta
+        beta = (fund_dev @ benchmark_dev) / benchmark_variance
+        return float(beta)
     
-    def calculate_max_drawdown(self, nav_data: pd.Series) -> float:
+    def calculate_max_drawdown(self, nav_data: pd.Series, ctx: Optional[FundContext] = None) -> float:
         """
         Calculate maximum drawdown.
         
         Args:
             nav_data: Series of NAV values
+            ctx: Optional precomputed FundContext (uses its sorted NAV array)
             
         Returns:
             Maximum drawdown percentage
         """
+        if ctx is not None:
+            return max_drawdown(ctx.nav)
+        
         if len(nav_data) == 0:
             return 0.0
         
-        peak = nav_data.expanding().max()
-        drawdown = (nav_data - peak) / peak * 100
-        max_drawdown = drawdown.min()
-        
-        return abs(max_drawdown)
+        return max_drawdown(nav_data.to_numpy(dtype=np.float64))
     
     def analyze_fund(self, fund_data: Dict) -> Dict:
         """
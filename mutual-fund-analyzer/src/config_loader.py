@@ -0,0 +1,39 @@
+"""
+Config Loader
+Loads the YAML pipeline configuration shared by the fetcher, ranker and CLI.
+"""
+
+import copy
+import os
+from functools import lru_cache
+from typing import Dict
+
+import yaml
+
+# libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=4)
+def _parse_config(config_path: str, mtime_ns: int) -> Dict:
+    """Parse a YAML config once per (path, modification time)."""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+def load_config(config_path) -> Dict:
+    """
+    Load configuration from a YAML file (parsed once per process unless the file changes).
+    
+    Args:
+        config_path: Path to the config file
+        
+    Returns:
+        A fresh copy of the parsed config
+        
+    Raises:
+        FileNotFoundError: If config_path does not exist
+    """
+    config_path = os.path.abspath(config_path)
+    # Callers get their own copy, so the cached parse cannot be mutated
+    return copy.deepcopy(_parse_config(config_path, os.stat(config_path).st_mtime_ns))
@@ -5,15 +5,23 @@ Data freshness: 1 month
 """
 
 import os
-import json
+import shutil
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 
 
 class CacheManager:
-    """Manages caching of mutual fund data."""
+    """
+    Manages caching of mutual fund data.
+    Data is stored as Parquet (typed columns, snappy compression); the cache
+    timestamp and other metadata live in each file's key-value metadata, so
+    no separate metadata files are needed. NAV histories form one dataset
+    partitioned by scheme code: nav_data.parquet/scheme_code=<code>/part.parquet
+    """
     
     CACHE_DIR = "data/cache"
     FRESHNESS_DAYS = 30  # 1 month
@@ -28,10 +36,8 @@ class CacheManager:
         self.cache_dir = Path(cache_dir or self.CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Subdirectories
-        self.metadata_dir = self.cache_dir / "metadata"
-        self.nav_data_dir = self.cache_dir / "nav_data"
-        self.metadata_dir.mkdir(exist_ok=True)
+        # Partitioned NAV dataset
+        self.nav_data_dir = self.cache_dir / "nav_data.parquet"
         self.nav_data_dir.mkdir(exist_ok=True)
     
     def is_fresh(self, timestamp: datetime) -> bool:
@@ -52,70 +58,118 @@ class CacheManager:
     
     def get_all_funds_cache_path(self) -> Path:
         """Get path for all funds cache."""
-        return self.cache_dir / "all_funds.csv"
-    
-    def get_all_funds_metadata_path(self) -> Path:
-        """Get path for all funds metadata (timestamp)."""
-        return self.metadata_dir / "all_funds_metadata.json"
+        return self.cache_dir / "all_funds.parquet"
     
     def get_nav_cache_path(self, scheme_code: int) -> Path:
-        """Get path for NAV data cache."""
-        return self.nav_data_dir / f"{scheme_code}.csv"
-    
-    def get_nav_metadata_path(self, scheme_code: int) -> Path:
-        """Get path for NAV metadata."""
-        return self.metadata_dir / f"nav_{scheme_code}_metadata.json"
+        """Get path for NAV data cache (one partition of the NAV dataset)."""
+        return self.nav_data_dir / f"scheme_code={scheme_code}" / "part.parquet"
     
-    def save_all_funds(self, funds_df: pd.DataFrame) -> None:
+    def _write_parquet(self, df: pd.DataFrame, path: Path, metadata: Dict[str, str]) -> None:
         """
-        Save all funds data with timestamp.
+        Write a DataFrame to Parquet with cache metadata in the file footer.
         
         Args:
-            funds_df: DataFrame with all funds
+            df: Data to write
+            path: Target file
+            metadata: Extra key-value metadata (a 'timestamp' entry is added)
         """
-        # Save data
-        cache_path = self.get_all_funds_cache_path()
-        funds_df.to_csv(cache_path, index=False)
-        
-        # Save metadata
-        metadata = {
-            'timestamp': datetime.now().isoformat(),
-            'count': len(funds_df),
-            'columns': list(funds_df.columns)
-        }
-        metadata_path = self.get_all_funds_metadata_path()
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # Keep pandas' own schema metadata so dtypes round-trip
+            footer = dict(table.schema.metadata or {})
+            footer[b'timestamp'] = datetime.now().isoformat().encode()
+            for key, value in metadata.items():
+                footer[key.encode()] = str(value).encode()
+            
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partially written file
+            tmp_path = path.with_name(path.name + '.tmp')
+            pq.write_table(table.replace_schema_metadata(footer), tmp_path, compression='snappy')
+            os.replace(tmp_path, path)
+        except (pa.ArrowException, OSError) as e:
+            # A failed cache write must not lose freshly fetched data
+            print(f"Warning: could not write cache file {path}: {str(e)}")
     
-    def load_all_funds(self) -> Optional[pd.DataFrame]:
+    def _read_metadata(self, path: Path) -> Optional[Dict[str, str]]:
         """
-        Load all funds from cache if fresh.
+        Read cache metadata from a Parquet footer without loading the data.
         
+        Args:
+            path: Parquet file
+            
         Returns:
-            DataFrame if fresh cache exists, None otherwise
+            Metadata dictionary, or None if the file is missing or unreadable
         """
-        cache_path = self.get_all_funds_cache_path()
-        metadata_path = self.get_all_funds_metadata_path()
-        
-        if not cache_path.exists() or not metadata_path.exists():
+        if not path.exists():
             return None
+        try:
+            footer = pq.read_schema(path).metadata or {}
+        except Exception:
+            return None
+        return {key.decode(): value.decode() for key, value in footer.items() if key != b'pandas'}
+    
+    def _read_fresh(self, path: Path, allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Load a cached Parquet file if its timestamp is fresh.
         
+        Args:
+            path: Parquet file
+            allow_stale: Return the data regardless of its age
+            
+        Returns:
+            DataFrame if fresh cache exists, None otherwise
+        """
         try:
-            # Check metadata
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            metadata = self._read_metadata(path)
+            if metadata is None or 'timestamp' not in metadata:
+                return None
             
             timestamp = datetime.fromisoformat(metadata['timestamp'])
-            if not self.is_fresh(timestamp):
+            if not allow_stale and not self.is_fresh(timestamp):
                 return None
             
-            # Load data
-            funds_df = pd.read_csv(cache_path)
-            return funds_df
+            # Dtypes (including datetimes) are stored, so no re-parsing is needed
+            return pd.read_parquet(path, engine='pyarrow')
         except Exception as e:
             # If any error, return None to force re-fetch
             return None
     
+    def save_all_funds(self, funds_df: pd.DataFrame, etag: Optional[str] = None) -> None:
+        """
+        Save all funds data with timestamp.
+        
+        Args:
+            funds_df: DataFrame with all funds
+            etag: Optional ETag of the API response, for conditional re-fetches
+        """
+        metadata = {'count': len(funds_df)}
+        if etag:
+            metadata['etag'] = etag
+        self._write_parquet(funds_df, self.get_all_funds_cache_path(), metadata)
+    
+    def load_all_funds(self, allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Load all funds from cache if fresh.
+        
+        Args:
+            allow_stale: Return cached funds regardless of age (used when the API
+                confirms the list is unchanged)
+        
+        Returns:
+            DataFrame if fresh (or, with allow_stale, any) cache exists, None otherwise
+        """
+        return self._read_fresh(self.get_all_funds_cache_path(), allow_stale=allow_stale)
+    
+    def get_all_funds_etag(self) -> Optional[str]:
+        """
+        Get the ETag stored with the cached funds list.
+        
+        Returns:
+            ETag string, or None if there is no cache or it was saved without one
+        """
+        metadata = self._read_metadata(self.get_all_funds_cache_path())
+        return metadata.get('etag') if metadata else None
+    
     def save_nav_data(self, scheme_code: int, nav_df: pd.DataFrame) -> None:
         """
         Save NAV data for a fund with timestamp.
@@ -124,12 +178,7 @@ class CacheManager:
             scheme_code: Scheme code
             nav_df: DataFrame with NAV data
         """
-        # Save data
-        cache_path = self.get_nav_cache_path(scheme_code)
-        nav_df.to_csv(cache_path, index=False)
-        
-        # Save metadata
-        # Convert dates to strings for JSON serialization
+        # Convert dates to strings for the metadata
         date_start = None
         date_end = None
         if 'date' in nav_df.columns and len(nav_df) > 0:
@@ -137,52 +186,26 @@ class CacheManager:
             date_end = str(nav_df['date'].max())
         
         metadata = {
-            'timestamp': datetime.now().isoformat(),
             'scheme_code': scheme_code,
             'rows': len(nav_df),
-            'date_range': {
-                'start': date_start,
-                'end': date_end
-            }
+            'date_start': date_start,
+            'date_end': date_end
         }
-        metadata_path = self.get_nav_metadata_path(scheme_code)
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        self._write_parquet(nav_df, self.get_nav_cache_path(scheme_code), metadata)
     
-    def load_nav_data(self, scheme_code: int) -> Optional[pd.DataFrame]:
+    def load_nav_data(self, scheme_code: int, allow_stale: bool = False) -> Optional[pd.DataFrame]:
         """
         Load NAV data from cache if fresh.
         
         Args:
             scheme_code: Scheme code
+            allow_stale: Return cached NAV regardless of age (used as the base
+                for incremental updates)
             
         Returns:
-            DataFrame if fresh cache exists, None otherwise
+            DataFrame if fresh (or, with allow_stale, any) cache exists, None otherwise
         """
-        cache_path = self.get_nav_cache_path(scheme_code)
-        metadata_path = self.get_nav_metadata_path(scheme_code)
-        
-        if not cache_path.exists() or not metadata_path.exists():
-            return None
-        
-        try:
-            # Check metadata
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            
-            timestamp = datetime.fromisoformat(metadata['timestamp'])
-            if not self.is_fresh(timestamp):
-                return None
-            
-            # Load data
-            nav_df = pd.read_csv(cache_path)
-            # Convert date column back to datetime
-            if 'date' in nav_df.columns:
-                nav_df['date'] = pd.to_datetime(nav_df['date'])
-            return nav_df
-        except Exception as e:
-            # If any error, return None to force re-fetch
-            return None
+        return self._read_fresh(self.get_nav_cache_path(scheme_code), allow_stale=allow_stale)
     
     def clear_cache(self, cache_type: str = 'all') -> None:
         """
@@ -193,18 +216,13 @@ class CacheManager:
         """
         if cache_type in ['all', 'funds']:
             cache_path = self.get_all_funds_cache_path()
-            metadata_path = self.get_all_funds_metadata_path()
             if cache_path.exists():
                 cache_path.unlink()
-            if metadata_path.exists():
-                metadata_path.unlink()
         
         if cache_type in ['all', 'nav']:
             # Clear all NAV caches
-            for nav_file in self.nav_data_dir.glob("*.csv"):
-                nav_file.unlink()
-            for meta_file in self.metadata_dir.glob("nav_*_metadata.json"):
-                meta_file.unlink()
+            shutil.rmtree(self.nav_data_dir, ignore_errors=True)
+            self.nav_data_dir.mkdir(exist_ok=True)
     
     def get_cache_stats(self) -> Dict:
         """
@@ -221,11 +239,9 @@ class CacheManager:
         }
         
         # Check all funds cache
-        metadata_path = self.get_all_funds_metadata_path()
-        if metadata_path.exists():
+        metadata = self._read_metadata(self.get_all_funds_cache_path())
+        if metadata is not None:
             try:
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
                 timestamp = datetime.fromisoformat(metadata['timestamp'])
                 age = datetime.now() - timestamp
                 stats['all_funds_cached'] = True
@@ -234,7 +250,7 @@ class CacheManager:
                 pass
         
         # Count NAV caches
-        nav_files = list(self.nav_data_dir.glob("*.csv"))
+        nav_files = list(self.nav_data_dir.glob("scheme_code=*/part.parquet"))
         stats['nav_data_cached_count'] = len(nav_files)
         
         return stats
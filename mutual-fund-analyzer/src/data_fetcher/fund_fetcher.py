@@ -4,11 +4,15 @@ Fetches mutual funds from various categories using MF API (api.mfapi.in).
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import time
 from typing import List, Dict, Optional
-import yaml
 import os
 from .mf_api_fetcher import MFAPIFetcher
+# Importable once mf_api_fetcher has put src/ on sys.path
+from config_loader import load_config
 
 
 class FundFetcher:
@@ -28,10 +32,9 @@ class FundFetcher:
         self.api_fetcher = MFAPIFetcher(rate_limit=0.5, config=self.config)
         
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file (parsed once per process unless the file changes)."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except FileNotFoundError:
             print(f"Config file not found: {config_path}")
             return {}
@@ -91,56 +94,90 @@ class FundFetcher:
             print("✗ Failed to fetch funds from API")
             return {cat: pd.DataFrame() for cat in self.categories}
         
-        # Categorize funds first
-        categorized_funds = self.api_fetcher.categorize_funds(all_funds_df)
+        # Categorize funds first (only the configured categories are built)
+        categorized_funds = self.api_fetcher.categorize_funds(all_funds_df, only=self.categories)
         
         # Get unique categories found in the data
         available_categories = list(categorized_funds.keys())
         print(f"\nFound categories in data: {', '.join(available_categories)}")
         
-        # Process each requested category
+        # Select each requested category's funds
+        selected = {}
         for category in self.categories:
+            if category in categorized_funds and not categorized_funds[category].empty:
+                selected[category] = categorized_funds[category].head(self.top_funds_count)
+        
+        # Download every selected fund's NAV history in one concurrent batch, so a
+        # single rate limiter spans all categories
+        nav_histories = {}
+        if selected:
+            scheme_codes = pd.unique(pd.concat([df['schemeCode'] for df in selected.values()]))
+            nav_histories = self.api_fetcher.fetch_fund_histories(scheme_codes)
+        
+        # Enrich each requested category from the prefetched histories. This is
+        # in-memory work that holds the GIL, so it runs sequentially
+        for category in self.categories:
+            if category not in selected:
+                print(f"⚠ No funds found for {category}")
+                all_funds[category] = pd.DataFrame()
+                continue
             try:
-                if category in categorized_funds and not categorized_funds[category].empty:
-                    # Get funds for this category and enrich with performance
-                    category_funds = categorized_funds[category].head(self.top_funds_count)
-                    funds_df = self.api_fetcher.enrich_funds_with_performance(
-                        category_funds, 
-                        max_funds=self.top_funds_count  # No limit - use config value
-                    )
-                    
-                    # Sort by returns
-                    if 'returns_5y' in funds_df.columns:
-                        funds_df = funds_df.sort_values('returns_5y', ascending=False, na_position='last')
-                    elif 'returns_3y' in funds_df.columns:
-                        funds_df = funds_df.sort_values('returns_3y', ascending=False, na_position='last')
-                    
-                    all_funds[category] = funds_df
-                    print(f"✓ Fetched {len(funds_df)} funds for {category}")
-                else:
-                    print(f"⚠ No funds found for {category}")
-                    all_funds[category] = pd.DataFrame()
+                all_funds[category] = self._process_category(category, selected[category], nav_histories)
+                print(f"✓ Fetched {len(all_funds[category])} funds for {category}")
             except Exception as e:
                 print(f"✗ Error fetching {category}: {str(e)}")
                 all_funds[category] = pd.DataFrame()
         
         return all_funds
     
+    def _process_category(self, category: str, category_funds: pd.DataFrame,
+                          nav_histories: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Enrich one category's funds with performance data and sort by returns.
+        
+        Args:
+            category: Fund category
+            category_funds: Funds selected for the category
+            nav_histories: Pre-fetched NAV histories keyed by scheme code
+            
+        Returns:
+            DataFrame with enriched funds sorted by returns
+        """
+        funds_df = self.api_fetcher.enrich_funds_with_performance(
+            category_funds, 
+            max_funds=self.top_funds_count,  # No limit - use config value
+            nav_histories=nav_histories
+        )
+        
+        # Sort by returns
+        if 'returns_5y' in funds_df.columns:
+            funds_df = funds_df.sort_values('returns_5y', ascending=False, na_position='last')
+        elif 'returns_3y' in funds_df.columns:
+            funds_df = funds_df.sort_values('returns_3y', ascending=False, na_position='last')
+        
+        return funds_df
+    
     def save_raw_data(self, funds_data: Dict[str, pd.DataFrame], output_dir: str = "data/raw"):
-        """Save raw fetched data to CSV files."""
+        """Save raw fetched data to CSV files (plus a combined Parquet file)."""
         os.makedirs(output_dir, exist_ok=True)
         
-        # Save all funds combined
-        all_funds_list = []
-        for category, df in funds_data.items():
-            if not df.empty:
-                all_funds_list.append(df)
+        # Save all funds combined: category frames are stitched as Arrow tables
+        # (chunks are referenced, not copied) and written straight from Arrow
+        all_funds_list = [df for df in funds_data.values() if not df.empty]
         
         if all_funds_list:
-            all_funds_df = pd.concat(all_funds_list, ignore_index=True)
+            tables = [pa.Table.from_pandas(df, preserve_index=False) for df in all_funds_list]
+            try:
+                all_funds_table = pa.concat_tables(tables, promote_options='permissive')
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Column types that Arrow cannot unify: let pandas reconcile them
+                all_funds_table = pa.Table.from_pandas(pd.concat(all_funds_list, ignore_index=True),
+                                                       preserve_index=False)
+            
             all_funds_path = os.path.join(output_dir, "all_funds.csv")
-            all_funds_df.to_csv(all_funds_path, index=False)
-            print(f"Saved {len(all_funds_df)} total funds to {all_funds_path}")
+            pa_csv.write_csv(all_funds_table, all_funds_path)
+            pq.write_table(all_funds_table, os.path.join(output_dir, "all_funds.parquet"))
+            print(f"Saved {all_funds_table.num_rows} total funds to {all_funds_path}")
         
         # Save by category
         category_dir = os.path.join(output_dir, "funds_by_category")
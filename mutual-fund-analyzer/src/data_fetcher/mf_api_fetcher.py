@@ -4,25 +4,223 @@ Fetches mutual fund data from api.mfapi.in API.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import time
+import threading
 import warnings
-from typing import Dict, List, Optional
+import weakref
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime, timedelta
 import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
 from .cache_manager import CacheManager
 
+# The analyzer package sits next to this one under src/; make it importable
+# even when data_fetcher was imported with only the project root on sys.path
+_SRC_DIR = str(Path(__file__).parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+from analyzer import ConsistencyAnalyzer, BenchmarkAnalyzer, FundContext
+from analyzer.nav_math import max_drawdown as nav_max_drawdown
+
+try:
+    import asyncio
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+
+def _loads(payload: bytes):
+    """Decode a JSON response body straight from bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+# Direct Plan filter, compiled once: must contain "direct" and none of the payout-option terms
+_DIRECT_PLAN_RE = re.compile('direct', re.IGNORECASE)
+_EXCLUDED_PLAN_RE = re.compile('idcw|bonus|periodic|dividend', re.IGNORECASE)
+
+
+def _direct_plan_mask(scheme_names: pd.Series) -> pd.Series:
+    """
+    Boolean mask of Direct Plan growth schemes.
+    One pass finds the "direct" names; the exclusion regex only scans those.
+    """
+    mask = scheme_names.str.contains(_DIRECT_PLAN_RE, na=False).to_numpy(dtype=bool, copy=True)
+    candidates = np.flatnonzero(mask)
+    if candidates.size:
+        excluded = scheme_names.iloc[candidates].str.contains(_EXCLUDED_PLAN_RE, na=False)
+        mask[candidates] = ~excluded.to_numpy(dtype=bool)
+    return pd.Series(mask, index=scheme_names.index)
+
+
+def _nav_metrics_loop(dates_ns: np.ndarray, nav: np.ndarray, period_ns: np.ndarray):
+    """
+    Trailing returns and max drawdown in one pass over date-sorted NAVs.
+    Returns (period returns %, max drawdown %); drawdown is NaN if no NAV is valid.
+    """
+    n = nav.size
+    latest_date = dates_ns[n - 1]
+    latest_idx = n - 1
+    while latest_idx > 0 and dates_ns[latest_idx - 1] == latest_date:
+        latest_idx -= 1
+    latest_nav = nav[latest_idx]
+    
+    n_periods = period_ns.size
+    past_idx = np.full(n_periods, -1, dtype=np.int64)
+    peak = -np.inf
+    max_dd = 0.0
+    any_valid = False
+    for i in range(n):
+        # Last NAV on or before each period's target date
+        for p in range(n_periods):
+            if dates_ns[i] <= latest_date - period_ns[p]:
+                past_idx[p] = i
+        # Running peak and deepest drawdown (NaN NAVs are skipped)
+        value = nav[i]
+        if value > peak:
+            peak = value
+        drawdown = (value - peak) / peak
+        if not np.isnan(drawdown):
+            any_valid = True
+            if drawdown < max_dd:
+                max_dd = drawdown
+    
+    period_returns = np.zeros(n_periods)
+    for p in range(n_periods):
+        idx = past_idx[p]
+        if idx >= 0 and nav[idx] > 0:
+            period_returns[p] = (latest_nav / nav[idx] - 1) * 100
+    
+    if not any_valid:
+        return period_returns, np.nan
+    return period_returns, (-max_dd * 100.0 if max_dd < 0 else 0.0)
+
+
+if NUMBA_AVAILABLE:
+    # error_model='numpy': a zero peak gives inf/NaN like NumPy instead of raising
+    _nav_metrics_kernel = njit(cache=True, nogil=True, error_model='numpy')(_nav_metrics_loop)
+
 # Suppress pandas/numpy warnings for NaN operations (harmless, just noisy)
 warnings.filterwarnings('ignore', category=RuntimeWarning, module='pandas.core.nanops')
 warnings.filterwarnings('ignore', category=RuntimeWarning, module='numpy.core._methods')
 
 
+class _TokenBucket:
+    """
+    Token-bucket rate limiter (GCRA form): up to `burst` requests may start
+    back to back, after which starts are spaced `interval` seconds apart on
+    average. Callers reserve a slot under a short lock and sleep outside it,
+    so threads and asyncio tasks can share one bucket.
+    """
+    
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tat = 0.0  # theoretical arrival time of the next request
+    
+    def reserve(self) -> float:
+        """Claim the next request slot and return the seconds to wait before starting."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+        return max(0.0, tat - (self.burst - 1) * self.interval - now)
+
+
 class MFAPIFetcher:
     """Fetches mutual fund data from api.mfapi.in."""
     
     BASE_URL = "https://api.mfapi.in/mf"
     
+    # Requests that may start back to back before rate_limit spacing applies
+    RATE_LIMIT_BURST = 8
+    
+    # Concurrent history downloads (aiohttp path)
+    ASYNC_CONCURRENCY = 16
+    ASYNC_MAX_RETRIES = 3
+    
+    # Keep-alive pool and transient-error retries for the sync requests session
+    HTTP_POOL_CONNECTIONS = 64
+    HTTP_POOL_MAXSIZE = 128
+    HTTP_MAX_RETRIES = 3
+    HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # In-process memo of NAV histories, keyed by (scheme_code, days)
+    HISTORY_MEMO_SIZE = 8192
+    
+    # Memo of lower-cased scheme name -> category index (cleared when full)
+    CATEGORY_MEMO_SIZE = 1 << 17
+    
+    # Trailing return periods in days (relative to the latest NAV date)
+    RETURN_PERIOD_DAYS = {
+        'returns_1y': 365,
+        'returns_3y': 365 * 3,
+        'returns_5y': 365 * 5,
+        'returns_10y': 365 * 10
+    }
+    
+    # Fields of the fund list response and their Arrow types (no per-call type inference)
+    FUND_LIST_SCHEMA = pa.schema([
+        ('schemeCode', pa.int64()),
+        ('schemeName', pa.string()),
+        ('isinGrowth', pa.string()),
+        ('isinDivReinvestment', pa.string()),
+    ])
+    
+    # Output columns of enrich_funds_with_performance and their dtypes
+    ENRICHED_COLUMNS = {
+        'scheme_code': np.int64,
+        'fund_name': object,
+        'category': object,
+        'nav': np.float64,
+        'returns_1y': np.float64,
+        'returns_3y': np.float64,
+        'returns_5y': np.float64,
+        'returns_10y': np.float64,
+        'sharpe_ratio': np.float64,
+        'standard_deviation': np.float64,
+        'max_drawdown': np.float64,
+        'risk_score': np.float64,
+        'consistency_score': np.float64,
+        'rolling_consistency': np.float64,
+        'alpha': np.float64,
+        'tracking_error': np.float64,
+        'benchmark_name': object,
+        'benchmark_outperformance': np.float64,
+        'source': object,
+        'isin_growth': object,
+    }
+    
     # Category keywords for classification
     CATEGORY_KEYWORDS = {
         'smallcap': ['small cap', 'smallcap', 'small-cap'],
@@ -41,34 +239,62 @@ class MFAPIFetcher:
         Initialize the API fetcher.
         
         Args:
-            rate_limit: Minimum seconds between API requests
+            rate_limit: Average seconds between API requests (after a short burst)
             config: Optional configuration dictionary for analyzer flags
         """
         self.rate_limit = rate_limit
         self.config = config or {}
         self.analyzer_flags = self.config.get('analysis', {}).get('analyzers', {})
-        self.last_request_time = 0
+        # The rate limiter is shared by threads (see FundFetcher) and async download tasks;
+        # the history memo by threads
+        self._rate_limiter = _TokenBucket(rate_limit, self.RATE_LIMIT_BURST)
+        self._memo_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        # Reuse sockets across calls and retry throttling/server errors with backoff
+        adapter = HTTPAdapter(
+            pool_connections=self.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.HTTP_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.HTTP_MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=self.HTTP_RETRY_STATUSES,
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # One session (and warm connection pool) serves every category for the fetcher's
+        # lifetime; its sockets are closed when the fetcher is collected or at exit
+        weakref.finalize(self, self.session.close)
         # Initialize cache manager
         self.cache_manager = CacheManager()
+        # LRU memo in front of the disk cache: repeated lookups within a run skip disk and network
+        self._history_memo = OrderedDict()
+        # One compiled alternation per category for vectorized classification
+        self._category_patterns = {
+            category: re.compile('|'.join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+            for category, keywords in self.CATEGORY_KEYWORDS.items()
+        }
+        # Single-pass keyword automaton (None when pyahocorasick is not installed)
+        self._category_labels = np.array(list(self.CATEGORY_KEYWORDS) + ['other'])
+        # Category columns store int8 codes instead of one string reference per row
+        self._category_dtype = pd.CategoricalDtype(self._category_labels)
+        self._category_automaton = self._build_category_automaton()
+        self._category_memo = {}
     
     def _rate_limit_check(self):
-        """Enforce rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
-        
-        self.last_request_time = time.time()
+        """Enforce rate limiting between requests (thread-safe; waiting threads sleep concurrently)."""
+        delay = self._rate_limiter.reserve()
+        if delay > 0:
+            time.sleep(delay)
     
     def fetch_all_funds(self, use_cache: bool = True) -> pd.DataFrame:
         """
         Fetch all mutual funds from the API.
-        Uses cache if available and fresh (less than 1 month old).
+        Uses cache if available and fresh (less than 1 month old). A stale cache
+        is revalidated with its ETag, so an unchanged list is not downloaded again.
         
         Args:
             use_cache: Whether to use cached data if available
@@ -77,32 +303,51 @@ class MFAPIFetcher:
             DataFrame with all funds
         """
         # Try to load from cache first
+        etag = None
         if use_cache:
             cached_funds = self.cache_manager.load_all_funds()
             if cached_funds is not None:
                 print(f"✓ Loaded {len(cached_funds)} funds from cache")
                 return cached_funds
+            etag = self.cache_manager.get_all_funds_etag()
         
         # Fetch from API
         print("Fetching all mutual funds from API...")
         self._rate_limit_check()
         
         try:
-            response = self.session.get(self.BASE_URL, timeout=30)
+            headers = {'If-None-Match': etag} if etag else None
+            response = self.session.get(self.BASE_URL, timeout=30, headers=headers)
+            if response.status_code == 304:
+                cached_funds = self.cache_manager.load_all_funds(allow_stale=True)
+                if cached_funds is not None:
+                    # Unchanged upstream: re-stamp the cache instead of re-downloading
+                    self.cache_manager.save_all_funds(cached_funds, etag=etag)
+                    print(f"✓ Funds list unchanged; loaded {len(cached_funds)} funds from cache")
+                    return cached_funds
+                self._rate_limit_check()
+                response = self.session.get(self.BASE_URL, timeout=30)
             response.raise_for_status()
-            funds_data = response.json()
+            funds_data = _loads(response.content)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(funds_data)
+            # Build Arrow columns of the declared types directly from the records (no per-row
+            # Python objects in pandas). If a field has mixed types, coerce it in pandas instead:
+            # non-numeric scheme codes become missing and are dropped below
+            try:
+                df = pa.Table.from_pylist(funds_data, schema=self.FUND_LIST_SCHEMA).to_pandas()
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df = pd.DataFrame.from_records(funds_data, columns=self.FUND_LIST_SCHEMA.names)
+                df = df.astype({name: 'str' for name in self.FUND_LIST_SCHEMA.names[1:]})
+                df['schemeCode'] = pd.to_numeric(df['schemeCode'], errors='coerce')
             
             # Filter out funds without schemeCode
-            df = df[df['schemeCode'].notna()]
+            df = df[df['schemeCode'].notna()].astype({'schemeCode': np.int64})
             
             print(f"✓ Fetched {len(df)} funds from API")
             
             # Save to cache
             if use_cache:
-                self.cache_manager.save_all_funds(df)
+                self.cache_manager.save_all_funds(df, etag=response.headers.get('ETag'))
             
             return df
             
@@ -110,6 +355,49 @@ class MFAPIFetcher:
             print(f"Error fetching funds: {str(e)}")
             return pd.DataFrame()
     
+    def _build_category_automaton(self):
+        """
+        Compile all category keywords into one Aho-Corasick automaton.
+        Each keyword maps to its category's position in CATEGORY_KEYWORDS, so a
+        keyword listed under several categories keeps the earliest one.
+        
+        Returns:
+            Automaton, or None when pyahocorasick is not installed
+        """
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for priority, keywords in enumerate(self.CATEGORY_KEYWORDS.values()):
+            for keyword in keywords:
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+        return automaton
+    
+    def _category_priority(self, scheme_name_lower: str) -> int:
+        """
+        Scan a lower-cased name once and return the index of the first matching
+        category in CATEGORY_KEYWORDS order (len(CATEGORY_KEYWORDS) if none match).
+        Results are memoized per name, so re-classifying the same fund list (e.g.
+        once per category in fetch_funds_by_category) skips the automaton scan.
+        """
+        best = self._category_memo.get(scheme_name_lower)
+        if best is not None:
+            return best
+        
+        best = len(self.CATEGORY_KEYWORDS)
+        for _, priority in self._category_automaton.iter(scheme_name_lower):
+            if priority < best:
+                best = priority
+                if best == 0:
+                    break
+        
+        if len(self._category_memo) >= self.CATEGORY_MEMO_SIZE:
+            self._category_memo.clear()
+        self._category_memo[scheme_name_lower] = best
+        return best
+    
     def classify_fund_category(self, scheme_name: str) -> str:
         """
         Classify fund into category based on scheme name.
@@ -122,6 +410,9 @@ class MFAPIFetcher:
         """
         scheme_name_lower = scheme_name.lower()
         
+        if self._category_automaton is not None:
+            return str(self._category_labels[self._category_priority(scheme_name_lower)])
+        
         # Check each category
         for category, keywords in self.CATEGORY_KEYWORDS.items():
             if any(keyword in scheme_name_lower for keyword in keywords):
@@ -130,12 +421,36 @@ class MFAPIFetcher:
         # Default to 'other' if no match
         return 'other'
     
-    def categorize_funds(self, funds_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    def _classify_all(self, scheme_names: pd.Series) -> np.ndarray:
+        """
+        Classify many scheme names at once.
+        Equivalent to classify_fund_category per name: the first category (in
+        CATEGORY_KEYWORDS order) with a matching keyword wins.
+        
+        Args:
+            scheme_names: Series of scheme names
+            
+        Returns:
+            Array of category names ('other' if no match)
+        """
+        if self._category_automaton is not None:
+            lowered = scheme_names.str.lower().tolist()
+            priorities = [self._category_priority(name) if isinstance(name, str) else len(self.CATEGORY_KEYWORDS)
+                          for name in lowered]
+            return self._category_labels[priorities]
+        
+        masks = [scheme_names.str.contains(pattern, regex=True, na=False).to_numpy()
+                 for pattern in self._category_patterns.values()]
+        return np.select(masks, list(self._category_patterns), default='other')
+    
+    def categorize_funds(self, funds_df: pd.DataFrame,
+                         only: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
         """
         Categorize funds into different categories.
         
         Args:
             funds_df: DataFrame with all funds
+            only: Optional categories to build; other categories are left out of the result
             
         Returns:
             Dictionary mapping categories to fund DataFrames
@@ -144,26 +459,22 @@ class MFAPIFetcher:
         
         categorized = {}
         
+        # Filter to Direct Plan funds once (strict filtering: must contain "direct" and none of
+        # IDCW, Bonus, Periodic, Dividend), label them, then split by label in one grouping pass
+        direct_plan = _direct_plan_mask(funds_df['schemeName']).to_numpy()
+        direct_funds = funds_df[direct_plan]
+        direct_funds = direct_funds.assign(category=pd.Categorical(
+            self._classify_all(direct_funds['schemeName']), dtype=self._category_dtype))
+        group_rows = direct_funds.groupby('category', observed=True, sort=False).indices
+        
+        wanted = self.CATEGORY_KEYWORDS.keys() if only is None else set(only)
         for category in self.CATEGORY_KEYWORDS.keys():
-            mask = funds_df['schemeName'].apply(
-                lambda x: self.classify_fund_category(x) == category
-            )
-            category_funds = funds_df[mask].copy()
-            category_funds['category'] = category
-            
-            # Filter to only Direct Plan funds (strict filtering)
-            # Must contain "direct" and must NOT contain IDCW, Bonus, Periodic, Dividend
-            direct_plan_funds = category_funds[
-                category_funds['schemeName'].str.contains('direct', case=False, na=False) &
-                ~category_funds['schemeName'].str.contains('idcw', case=False, na=False) &
-                ~category_funds['schemeName'].str.contains('bonus', case=False, na=False) &
-                ~category_funds['schemeName'].str.contains('periodic', case=False, na=False) &
-                ~category_funds['schemeName'].str.contains('dividend', case=False, na=False)
-            ]
+            if category not in wanted:
+                continue
             
             # Only include Direct Plan funds (no fallback to other options)
-            if len(direct_plan_funds) > 0:
-                categorized[category] = direct_plan_funds
+            if category in group_rows:
+                categorized[category] = direct_funds.iloc[group_rows[category]]
             else:
                 # Return empty DataFrame if no Direct Plan funds found
                 categorized[category] = pd.DataFrame()
@@ -175,7 +486,9 @@ class MFAPIFetcher:
     def fetch_fund_history(self, scheme_code: int, days: int = 3650, use_cache: bool = True) -> Optional[pd.DataFrame]:
         """
         Fetch historical NAV data for a fund.
-        Uses cache if available and fresh (less than 1 month old).
+        Uses cache if available and fresh (less than 1 month old). A stale cache
+        is updated incrementally: only NAVs from its last date onwards are
+        downloaded and merged in.
         
         Args:
             scheme_code: Scheme code of the fund
@@ -185,51 +498,306 @@ class MFAPIFetcher:
         Returns:
             DataFrame with date and NAV, or None if error
         """
-        # Try to load from cache first
+        # Try the in-process memo, then the disk cache
         if use_cache:
+            memo_hit = self._recall_history(scheme_code, days)
+            if memo_hit is not None:
+                return memo_hit
+            
             cached_nav = self.cache_manager.load_nav_data(scheme_code)
             if cached_nav is not None:
+                self._remember_history(scheme_code, days, cached_nav)
                 return cached_nav
         
+        # Stale cache (if any) is the base for an incremental update
+        stale_nav = self.cache_manager.load_nav_data(scheme_code, allow_stale=True) if use_cache else None
+        
         # Fetch from API
+        df = self._download_history(scheme_code, days, stale_nav)
+        
+        # Save to cache
+        if use_cache and df is not None:
+            self.cache_manager.save_nav_data(scheme_code, df)
+            self._remember_history(scheme_code, days, df)
+        
+        return df
+    
+    def _download_history(self, scheme_code: int, days: int,
+                          cached_nav: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+        """
+        Download one scheme's NAV history over the requests session.
+        
+        Args:
+            scheme_code: Scheme code of the fund
+            days: Number of days of history to keep
+            cached_nav: Previously cached history; only newer NAVs are requested
+            
+        Returns:
+            DataFrame with date and NAV, or None if error
+        """
         self._rate_limit_check()
         
         try:
             url = f"{self.BASE_URL}/{scheme_code}"
-            response = self.session.get(url, timeout=30)
+            response = self.session.get(url, params=self._history_params(cached_nav), timeout=30)
             response.raise_for_status()
             
-            data = response.json()
-            
-            if data.get('status') != 'SUCCESS' or 'data' not in data:
-                return None
+            data = _loads(response.content)
             
-            nav_data = data['data']
+            return self._parse_history_payload(data, days, cached_nav)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(nav_data)
+        except Exception as e:
+            print(f"Error fetching history for scheme {scheme_code}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _history_params(cached_nav: Optional[pd.DataFrame]) -> Optional[Dict[str, str]]:
+        """
+        Build the date-filter query for an incremental history update.
+        The last cached date is requested again so a restated NAV replaces it.
+        
+        Args:
+            cached_nav: Previously cached history
             
-            # Convert date and NAV
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-            df['nav'] = pd.to_numeric(df['nav'], errors='coerce')
+        Returns:
+            startDate/endDate query parameters, or None to download the full history
+        """
+        if cached_nav is None or cached_nav.empty:
+            return None
+        
+        last_date = cached_nav['date'].max()
+        if pd.isna(last_date):
+            return None
+        
+        return {
+            'startDate': last_date.strftime('%Y-%m-%d'),
+            'endDate': datetime.now().strftime('%Y-%m-%d'),
+        }
+    
+    def _recall_history(self, scheme_code: int, days: int) -> Optional[pd.DataFrame]:
+        """Return a memoized NAV history (marking it recently used), or None."""
+        memo_key = (int(scheme_code), days)
+        with self._memo_lock:
+            nav_df = self._history_memo.get(memo_key)
+            if nav_df is not None:
+                self._history_memo.move_to_end(memo_key)
+            return nav_df
+    
+    def _remember_history(self, scheme_code: int, days: int, nav_df: pd.DataFrame) -> None:
+        """
+        Add a NAV history to the in-process LRU memo.
+        Failed fetches (None) are not memoized so they are retried.
+        
+        Args:
+            scheme_code: Scheme code of the fund
+            days: Number of days of history the DataFrame covers
+            nav_df: NAV history
+        """
+        memo_key = (int(scheme_code), days)
+        with self._memo_lock:
+            self._history_memo[memo_key] = nav_df
+            self._history_memo.move_to_end(memo_key)
+            if len(self._history_memo) > self.HISTORY_MEMO_SIZE:
+                self._history_memo.popitem(last=False)
+    
+    def _parse_history_payload(self, data: Dict, days: int,
+                               cached_nav: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+        """
+        Convert a scheme history API response into a NAV DataFrame.
+        
+        Args:
+            data: Decoded JSON response for one scheme
+            days: Number of days of history to keep
+            cached_nav: Previously cached history to merge the new NAVs into
+                (a NAV for an already cached date replaces the cached one)
             
-            # Sort by date
-            df = df.sort_values('date')
+        Returns:
+            DataFrame with date and NAV sorted by date, or None if the response has no data
+        """
+        if data.get('status') != 'SUCCESS' or 'data' not in data:
+            return None
+        
+        nav_data = data['data']
+        
+        # Convert to DataFrame (dates and NAVs parsed column-wise)
+        df = self._nav_frame(nav_data)
+        
+        # Append to the cached history
+        if cached_nav is not None and not cached_nav.empty:
+            df = pd.concat([cached_nav, df], ignore_index=True).drop_duplicates('date', keep='last')
+        
+        if df.empty:
+            return None
+        
+        # Sort by date
+        df = df.sort_values('date')
+        
+        # Limit to requested days
+        if len(df) > 0:
+            cutoff_date = df['date'].max() - timedelta(days=days)
+            df = df[df['date'] >= cutoff_date]
+        
+        return df
+    
+    @staticmethod
+    def _nav_frame(nav_data: List[Dict]) -> pd.DataFrame:
+        """
+        Parse API NAV records into a date/nav DataFrame.
+        Records go into Arrow columns once; dates are parsed with one strptime
+        kernel and NAV strings with one cast, instead of per-row Python objects.
+        
+        Args:
+            nav_data: List of {'date': 'dd-mm-YYYY', 'nav': '123.4567'} records
             
-            # Limit to requested days
-            if len(df) > 0:
-                cutoff_date = df['date'].max() - timedelta(days=days)
-                df = df[df['date'] >= cutoff_date]
+        Returns:
+            DataFrame with datetime date and float64 nav (unparseable NAVs are NaN)
+        """
+        if not nav_data:
+            return pd.DataFrame({'date': pd.Series(dtype='datetime64[us]'), 'nav': pd.Series(dtype=np.float64)})
+        
+        try:
+            table = pa.Table.from_pylist(nav_data)
+            dates = pc.strptime(table['date'], format='%d-%m-%Y', unit='us').to_pandas()
+            try:
+                navs = pc.cast(table['nav'], pa.float64()).to_pandas()
+            except pa.ArrowInvalid:
+                # Placeholder values such as 'N.A.' become NaN, as with errors='coerce'
+                navs = pd.to_numeric(table['nav'].to_pandas(), errors='coerce')
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type records: fall back to pandas inference
+            raw = pd.DataFrame(nav_data)
+            dates = pd.to_datetime(raw['date'], format='%d-%m-%Y')
+            navs = pd.to_numeric(raw['nav'], errors='coerce')
+        
+        return pd.DataFrame({'date': dates, 'nav': navs})
+    
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Whether the calling thread is already running an asyncio event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    def fetch_fund_histories(self, scheme_codes: List[int], days: int = 3650,
+                             use_cache: bool = True) -> Dict[int, Optional[pd.DataFrame]]:
+        """
+        Fetch historical NAV data for many funds.
+        Cached histories are used as-is; the rest are downloaded concurrently
+        with aiohttp (respecting the rate limit), or one by one when aiohttp
+        is not installed. Stale cached histories are updated incrementally.
+        
+        Args:
+            scheme_codes: Scheme codes of the funds
+            days: Number of days of history to fetch (default 10 years)
+            use_cache: Whether to use cached data if available
             
-            # Save to cache
+        Returns:
+            Dictionary mapping scheme code to its NAV DataFrame (None if unavailable)
+        """
+        histories = {}
+        missing = []
+        
+        for scheme_code in scheme_codes:
+            scheme_code = int(scheme_code)
+            cached_nav = None
             if use_cache:
+                cached_nav = self._recall_history(scheme_code, days)
+                if cached_nav is None:
+                    cached_nav = self.cache_manager.load_nav_data(scheme_code)
+                    if cached_nav is not None:
+                        self._remember_history(scheme_code, days, cached_nav)
+            if cached_nav is not None:
+                histories[scheme_code] = cached_nav
+            else:
+                missing.append(scheme_code)
+        
+        if not missing:
+            return histories
+        
+        # Stale cached histories are the base for incremental updates
+        stale_navs = {}
+        if use_cache:
+            stale_navs = {code: self.cache_manager.load_nav_data(code, allow_stale=True) for code in missing}
+        
+        fetched = None
+        if AIOHTTP_AVAILABLE and not self._in_event_loop():
+            # Errors raised by the downloads themselves propagate to the caller
+            fetched = asyncio.run(self._fetch_histories_async(missing, days, stale_navs))
+        
+        if fetched is None:
+            # No aiohttp, or already inside a running event loop; use the blocking path
+            fetched = {code: self._download_history(code, days, stale_navs.get(code)) for code in missing}
+        
+        for scheme_code, df in fetched.items():
+            if use_cache and df is not None:
                 self.cache_manager.save_nav_data(scheme_code, df)
+                self._remember_history(scheme_code, days, df)
+            histories[scheme_code] = df
+        
+        return histories
+    
+    async def _fetch_histories_async(self, scheme_codes: List[int], days: int,
+                                     cached_navs: Optional[Dict[int, pd.DataFrame]] = None
+                                     ) -> Dict[int, Optional[pd.DataFrame]]:
+        """
+        Download NAV histories concurrently over one aiohttp session.
+        
+        Args:
+            scheme_codes: Scheme codes to download
+            days: Number of days of history to keep
+            cached_navs: Stale cached histories to update incrementally, by scheme code
             
-            return df
-            
-        except Exception as e:
-            print(f"Error fetching history for scheme {scheme_code}: {str(e)}")
-            return None
+        Returns:
+            Dictionary mapping scheme code to its NAV DataFrame (None on error)
+        """
+        semaphore = asyncio.Semaphore(self.ASYNC_CONCURRENCY)
+        connector = aiohttp.TCPConnector(limit=1024, limit_per_host=64)
+        headers = {'User-Agent': self.session.headers['User-Agent']}
+        cached_navs = cached_navs or {}
+        
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*[
+                self._fetch_history_async(session, semaphore, scheme_code, days,
+                                          cached_navs.get(scheme_code))
+                for scheme_code in scheme_codes
+            ])
+        
+        return dict(results)
+    
+    async def _fetch_history_async(self, session, semaphore, scheme_code: int, days: int,
+                                   cached_nav: Optional[pd.DataFrame] = None):
+        """
+        Download one scheme's NAV history, retrying transient errors with exponential backoff.
+        
+        Returns:
+            Tuple of (scheme_code, DataFrame or None)
+        """
+        url = f"{self.BASE_URL}/{scheme_code}"
+        params = self._history_params(cached_nav)
+        
+        for attempt in range(self.ASYNC_MAX_RETRIES):
+            try:
+                async with semaphore:
+                    # Same token bucket as the sync path, so mixed callers share one budget
+                    delay = self._rate_limiter.reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        response.raise_for_status()
+                        data = _loads(await response.read())
+                return scheme_code, self._parse_history_payload(data, days, cached_nav)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Only rate limiting, server errors and connection problems are worth retrying
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500
+                if not retryable or attempt == self.ASYNC_MAX_RETRIES - 1:
+                    print(f"Error fetching history for scheme {scheme_code}: {str(e)}")
+                    return scheme_code, None
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                print(f"Error fetching history for scheme {scheme_code}: {str(e)}")
+                return scheme_code, None
     
     def calculate_returns(self, nav_df: pd.DataFrame) -> Dict[str, float]:
         """
@@ -241,53 +809,72 @@ class MFAPIFetcher:
         Returns:
             Dictionary with returns for different periods
         """
+        returns, _ = self._nav_to_metrics(nav_df)
+        return returns
+    
+    def _nav_to_metrics(self, nav_df: Optional[pd.DataFrame]):
+        """
+        Calculate trailing returns and maximum drawdown together.
+        The numeric work runs in one compiled pass over the date-sorted NAV
+        (numba), or as NumPy searchsorted/accumulate when numba is missing.
+        
+        Args:
+            nav_df: DataFrame with date and nav columns
+            
+        Returns:
+            Tuple of (returns dictionary, max drawdown percentage or None if no history)
+        """
+        periods = self.RETURN_PERIOD_DAYS
         if nav_df is None or len(nav_df) == 0:
-            return {
-                'returns_1y': 0.0,
-                'returns_3y': 0.0,
-                'returns_5y': 0.0,
-                'returns_10y': 0.0
-            }
+            return dict.fromkeys(periods, 0.0), None
         
-        returns = {}
-        latest_date = nav_df['date'].max()
-        latest_nav = nav_df[nav_df['date'] == latest_date]['nav'].iloc[0]
+        # Histories are stored date-sorted; only sort when handed something else
+        if not nav_df['date'].is_monotonic_increasing:
+            nav_df = nav_df.sort_values('date', kind='stable')
+        dates = nav_df['date'].to_numpy(dtype='datetime64[ns]')
+        nav = nav_df['nav'].to_numpy(dtype=np.float64)
+        valid_dates = ~np.isnat(dates)
+        if not valid_dates.all():
+            dates, nav = dates[valid_dates], nav[valid_dates]
+        if dates.size == 0:
+            return dict.fromkeys(periods, 0.0), None
         
-        # Calculate returns for different periods
-        periods = {
-            'returns_1y': 365,
-            'returns_3y': 365 * 3,
-            'returns_5y': 365 * 5,
-            'returns_10y': 365 * 10
-        }
+        period_offsets = np.array(list(periods.values()), dtype='timedelta64[D]').astype('timedelta64[ns]')
         
-        for period_name, days in periods.items():
-            target_date = latest_date - timedelta(days=days)
-            past_data = nav_df[nav_df['date'] <= target_date]
-            
-            if len(past_data) > 0:
-                past_nav = past_data.iloc[-1]['nav']
-                if past_nav > 0:
-                    returns[period_name] = ((latest_nav / past_nav) - 1) * 100
-                else:
-                    returns[period_name] = 0.0
-            else:
-                returns[period_name] = 0.0
+        if NUMBA_AVAILABLE:
+            period_returns, max_drawdown = _nav_metrics_kernel(
+                dates.view(np.int64), np.ascontiguousarray(nav), period_offsets.view(np.int64))
+            return dict(zip(periods, period_returns.tolist())), float(max_drawdown)
         
-        return returns
+        latest_date = dates[-1]
+        latest_nav = nav[np.searchsorted(dates, latest_date, side='left')]
+        
+        # One binary search for all periods: index of the last NAV on or before each target date
+        past_idx = np.searchsorted(dates, latest_date - period_offsets, side='right') - 1
+        past_nav = nav[np.maximum(past_idx, 0)]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            period_returns = np.where((past_idx >= 0) & (past_nav > 0),
+                                      (latest_nav / past_nav - 1) * 100, 0.0)
+        
+        return dict(zip(periods, period_returns.tolist())), nav_max_drawdown(nav)
     
-    def calculate_risk_metrics(self, nav_df: pd.DataFrame, risk_free_rate: float = 6.0) -> Dict[str, float]:
+    def calculate_risk_metrics(self, nav_df: pd.DataFrame, risk_free_rate: float = 6.0,
+                               ctx=None, max_drawdown: Optional[float] = None) -> Dict[str, float]:
         """
         Calculate risk metrics from NAV data.
         
         Args:
             nav_df: DataFrame with date and nav columns
             risk_free_rate: Risk-free rate (default 6% for India)
+            ctx: Optional analyzer FundContext (reuses its sorted NAV and returns)
+            max_drawdown: Optional precomputed maximum drawdown (see _nav_to_metrics)
             
         Returns:
             Dictionary with risk metrics
         """
-        if nav_df is None or len(nav_df) < 2:
+        nav_count = ctx.nav.size if ctx is not None else (0 if nav_df is None else len(nav_df))
+        if nav_count < 2:
             return {
                 'sharpe_ratio': 0.0,
                 'standard_deviation': 0.0,
@@ -295,14 +882,17 @@ class MFAPIFetcher:
                 'risk_score': 0.0
             }
         
-        # Calculate monthly returns
-        nav_df = nav_df.sort_values('date')
-        nav_df['returns'] = nav_df['nav'].pct_change() * 100  # Percentage returns
-        
-        # Remove first row (NaN)
-        returns_series = nav_df['returns'].dropna()
+        if ctx is not None:
+            nav = ctx.nav
+            returns = ctx.returns
+        else:
+            # Period percentage returns on plain arrays (pct_change without a DataFrame column)
+            nav = nav_df.sort_values('date')['nav'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.diff(nav) / nav[:-1] * 100
+            returns = returns[~np.isnan(returns)]
         
-        if len(returns_series) < 2:
+        if returns.size < 2:
             return {
                 'sharpe_ratio': 0.0,
                 'standard_deviation': 0.0,
@@ -311,20 +901,20 @@ class MFAPIFetcher:
             }
         
         # Calculate standard deviation (annualized)
-        std_dev = returns_series.std() * np.sqrt(12)  # Annualized
+        # (a zero NAV yields inf returns; std is then NaN, as with pandas)
+        with np.errstate(invalid='ignore'):
+            std_dev = returns.std(ddof=1) * np.sqrt(12)  # Annualized
         
         # Calculate Sharpe ratio
         if std_dev > 0:
-            excess_returns = returns_series - (risk_free_rate / 12)
+            excess_returns = returns - (risk_free_rate / 12)
             sharpe = (excess_returns.mean() / std_dev) * np.sqrt(12)  # Annualized
         else:
             sharpe = 0.0
         
         # Calculate maximum drawdown
-        nav_series = nav_df['nav']
-        peak = nav_series.expanding().max()
-        drawdown = (nav_series - peak) / peak * 100
-        max_drawdown = abs(drawdown.min())
+        if max_drawdown is None:
+            max_drawdown = nav_max_drawdown(nav)
         
         # Calculate risk score (0-100, higher = riskier)
         # Based on standard deviation and max drawdown
@@ -338,37 +928,60 @@ class MFAPIFetcher:
         }
     
     def enrich_funds_with_performance(self, funds_df: pd.DataFrame, max_funds: int = 100, 
-                                      config: Dict = None) -> pd.DataFrame:
+                                      config: Dict = None,
+                                      nav_histories: Optional[Dict[int, pd.DataFrame]] = None) -> pd.DataFrame:
         """
         Enrich funds DataFrame with performance data.
         
         Args:
             funds_df: DataFrame with fund information
             max_funds: Maximum number of funds to process
+            nav_histories: Optional pre-fetched NAV histories keyed by scheme code
+                (see fetch_fund_histories); missing funds are fetched individually
             
         Returns:
             Enriched DataFrame
         """
         print(f"Enriching {min(len(funds_df), max_funds)} funds with performance data...")
         
-        enriched_data = []
+        # Analyzers are stateless per fund: build them once for the whole batch
+        consistency_analyzer = ConsistencyAnalyzer()
+        benchmark_analyzer = BenchmarkAnalyzer()
+        
+        # Pull the needed columns out once and zip over plain arrays (no per-row Series)
+        funds = funds_df.head(max_funds)
+        total = len(funds)
+        codes = funds['schemeCode'].to_numpy()
+        names = funds['schemeName'].to_numpy()
+        categories = funds['category'].to_numpy() if 'category' in funds.columns else ['other'] * total
+        isins = funds['isinGrowth'].to_numpy() if 'isinGrowth' in funds.columns else [''] * total
         
-        for idx, fund in funds_df.head(max_funds).iterrows():
-            scheme_code = int(fund['schemeCode'])
-            scheme_name = fund['schemeName']
+        # Preallocated typed columns, filled row by row and wrapped once at the end
+        columns = {column: np.empty(total, dtype=dtype) for column, dtype in self.ENRICHED_COLUMNS.items()}
+        
+        for position, (scheme_code, scheme_name, fund_category, isin_growth) in enumerate(
+                zip(codes, names, categories, isins), start=1):
+            scheme_code = int(scheme_code)
             
-            if (idx + 1) % 10 == 0:
-                print(f"  Processed {idx+1}/{min(len(funds_df), max_funds)} funds...")
+            if position % 10 == 0:
+                print(f"  Processed {position}/{total} funds...")
             
             # Fetch historical data
-            nav_history = self.fetch_fund_history(scheme_code)
+            if nav_histories is not None and scheme_code in nav_histories:
+                nav_history = nav_histories[scheme_code]
+            else:
+                nav_history = self.fetch_fund_history(scheme_code)
+            
+            # Sort the NAV and derive returns/stats once; shared by all analyzers below
+            ctx = FundContext.from_nav(nav_history)
             
             # Performance Analyzer (returns and risk metrics) - always enabled by default
             returns = {}
             risk_metrics = {}
             if self.analyzer_flags.get('performance_analyzer', True):
-                returns = self.calculate_returns(nav_history)
-                risk_metrics = self.calculate_risk_metrics(nav_history)
+                # Trailing returns and drawdown come from one compiled pass over the NAV
+                returns, max_drawdown = self._nav_to_metrics(nav_history)
+                risk_metrics = self.calculate_risk_metrics(nav_history, ctx=ctx, max_drawdown=max_drawdown)
             else:
                 returns = {'returns_1y': 0.0, 'returns_3y': 0.0, 'returns_5y': 0.0, 'returns_10y': 0.0}
                 risk_metrics = {'sharpe_ratio': 0.0, 'standard_deviation': 0.0, 'max_drawdown': 0.0, 'risk_score': 0.0}
@@ -377,15 +990,7 @@ class MFAPIFetcher:
             consistency_metrics = {}
             if self.analyzer_flags.get('consistency_analyzer', True) and nav_history is not None and not nav_history.empty and len(nav_history) > 0:
                 try:
-                    import sys
-                    from pathlib import Path
-                    # Add parent directory to path for analyzer imports
-                    parent_dir = str(Path(__file__).parent.parent)
-                    if parent_dir not in sys.path:
-                        sys.path.insert(0, parent_dir)
-                    from analyzer import ConsistencyAnalyzer
-                    consistency_analyzer = ConsistencyAnalyzer()
-                    consistency_metrics = consistency_analyzer.analyze_fund_consistency(nav_history)
+                    consistency_metrics = consistency_analyzer.analyze_fund_consistency(nav_history, ctx=ctx)
                 except Exception as e:
                     # If analyzer fails, use defaults
                     consistency_metrics = {'consistency_score': 0.0, 'rolling_consistency': 0.0, 'coefficient_of_variation': 100.0}
@@ -396,10 +1001,8 @@ class MFAPIFetcher:
             benchmark_metrics = {}
             if self.analyzer_flags.get('benchmark_analyzer', True) and nav_history is not None and not nav_history.empty and len(nav_history) > 0:
                 try:
-                    from analyzer import BenchmarkAnalyzer
-                    benchmark_analyzer = BenchmarkAnalyzer()
                     benchmark_metrics = benchmark_analyzer.analyze_fund_benchmark(
-                        nav_history, scheme_name, fund.get('category', 'other')
+                        nav_history, scheme_name, fund_category, ctx=ctx
                     )
                 except Exception as e:
                     # If analyzer fails, use defaults
@@ -407,40 +1010,35 @@ class MFAPIFetcher:
             else:
                 benchmark_metrics = {'alpha': 0.0, 'tracking_error': 0.0, 'benchmark_outperformance': 0.0, 'benchmark_name': 'N/A'}
             
-            # Get current NAV
-            current_nav = 0.0
-            if nav_history is not None and len(nav_history) > 0:
-                current_nav = nav_history.iloc[-1]['nav']
-            
-            # Create enriched fund data
-            fund_data = {
-                'scheme_code': scheme_code,
-                'fund_name': scheme_name,
-                'category': fund.get('category', 'other'),
-                'nav': current_nav,
-                'returns_1y': returns.get('returns_1y', 0.0),
-                'returns_3y': returns.get('returns_3y', 0.0),
-                'returns_5y': returns.get('returns_5y', 0.0),
-                'returns_10y': returns.get('returns_10y', 0.0),
-                'sharpe_ratio': risk_metrics.get('sharpe_ratio', 0.0),
-                'standard_deviation': risk_metrics.get('standard_deviation', 0.0),
-                'max_drawdown': risk_metrics.get('max_drawdown', 0.0),
-                'risk_score': risk_metrics.get('risk_score', 0.0),
-                # Consistency metrics (new)
-                'consistency_score': consistency_metrics.get('consistency_score', 0.0),
-                'rolling_consistency': consistency_metrics.get('rolling_consistency', 0.0),
-                # Benchmark metrics (new)
-                'alpha': benchmark_metrics.get('alpha', 0.0),
-                'tracking_error': benchmark_metrics.get('tracking_error', 0.0),
-                'benchmark_name': benchmark_metrics.get('benchmark_name', 'N/A'),
-                'benchmark_outperformance': benchmark_metrics.get('benchmark_outperformance', 0.0),
-                'source': 'mfapi',
-                'isin_growth': fund.get('isinGrowth', ''),
-            }
+            # Current NAV: latest value of the date-sorted NAV array
+            current_nav = ctx.nav[-1] if not ctx.empty else 0.0
             
-            enriched_data.append(fund_data)
+            # Write the enriched fund into its row of each column
+            row = position - 1
+            columns['scheme_code'][row] = scheme_code
+            columns['fund_name'][row] = scheme_name
+            columns['category'][row] = fund_category
+            columns['nav'][row] = current_nav
+            columns['returns_1y'][row] = returns.get('returns_1y', 0.0)
+            columns['returns_3y'][row] = returns.get('returns_3y', 0.0)
+            columns['returns_5y'][row] = returns.get('returns_5y', 0.0)
+            columns['returns_10y'][row] = returns.get('returns_10y', 0.0)
+            columns['sharpe_ratio'][row] = risk_metrics.get('sharpe_ratio', 0.0)
+            columns['standard_deviation'][row] = risk_metrics.get('standard_deviation', 0.0)
+            columns['max_drawdown'][row] = risk_metrics.get('max_drawdown', 0.0)
+            columns['risk_score'][row] = risk_metrics.get('risk_score', 0.0)
+            # Consistency metrics (new)
+            columns['consistency_score'][row] = consistency_metrics.get('consistency_score', 0.0)
+            columns['rolling_consistency'][row] = consistency_metrics.get('rolling_consistency', 0.0)
+            # Benchmark metrics (new)
+            columns['alpha'][row] = benchmark_metrics.get('alpha', 0.0)
+            columns['tracking_error'][row] = benchmark_metrics.get('tracking_error', 0.0)
+            columns['benchmark_name'][row] = benchmark_metrics.get('benchmark_name', 'N/A')
+            columns['benchmark_outperformance'][row] = benchmark_metrics.get('benchmark_outperformance', 0.0)
+            columns['source'][row] = 'mfapi'
+            columns['isin_growth'][row] = isin_growth
         
-        return pd.DataFrame(enriched_data)
+        return pd.DataFrame(columns)
     
     def fetch_funds_by_category(self, category: str, all_funds_df: pd.DataFrame, max_funds: int = 100) -> pd.DataFrame:
         """
@@ -456,31 +1054,17 @@ class MFAPIFetcher:
         """
         print(f"Processing {category} funds...")
         
-        # Filter funds for this category
-        category_funds = all_funds_df[
-            all_funds_df['schemeName'].apply(
-                lambda x: self.classify_fund_category(x) == category
-            )
-        ].copy()
-        
-        # Filter to only Direct Plan funds (strict filtering)
-        # Must contain "direct" and must NOT contain IDCW, Bonus, Periodic, Dividend
-        direct_plan_funds = category_funds[
-            category_funds['schemeName'].str.contains('direct', case=False, na=False) &
-            ~category_funds['schemeName'].str.contains('idcw', case=False, na=False) &
-            ~category_funds['schemeName'].str.contains('bonus', case=False, na=False) &
-            ~category_funds['schemeName'].str.contains('periodic', case=False, na=False) &
-            ~category_funds['schemeName'].str.contains('dividend', case=False, na=False)
-        ]
-        
-        if len(direct_plan_funds) > 0:
-            funds_to_process = direct_plan_funds.head(max_funds)
-        else:
-            # If no direct plan funds found, return empty (don't fall back to other options)
-            funds_to_process = category_funds.head(0)  # Empty DataFrame
+        # Strict Direct Plan filter first (must contain "direct" and must NOT contain IDCW,
+        # Bonus, Periodic, Dividend), then classify only those names for this category.
+        # No fallback to other plan options: no Direct Plan funds means an empty result
+        direct_funds = all_funds_df[_direct_plan_mask(all_funds_df['schemeName']).to_numpy()]
+        direct_plan_funds = direct_funds[self._classify_all(direct_funds['schemeName']) == category]
+        funds_to_process = direct_plan_funds.head(max_funds)
         
-        # Enrich with performance data (config passed via __init__)
-        enriched_funds = self.enrich_funds_with_performance(funds_to_process, max_funds=max_funds)
+        # Download all NAV histories concurrently, then enrich (config passed via __init__)
+        nav_histories = self.fetch_fund_histories(funds_to_process['schemeCode'].head(max_funds))
+        enriched_funds = self.enrich_funds_with_performance(funds_to_process, max_funds=max_funds,
+                                                            nav_histories=nav_histories)
         
         # Add category
         enriched_funds['category'] = category
@@ -7,6 +7,7 @@ Uses MF API (api.mfapi.in) for data fetching.
 import argparse
 import sys
 import os
+import shutil
 from pathlib import Path
 
 # Add src to path
@@ -15,7 +16,18 @@ sys.path.insert(0, str(Path(__file__).parent))
 from data_fetcher import FundFetcher
 from analyzer import PerformanceAnalyzer
 from ranking import FundRanker
-import yaml
+from config_loader import load_config
+# Required (data_fetcher imports it too); also the parquet engine for DataFrame.to_parquet
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+try:
+    from openpyxl import Workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "config.yaml"
 
 
 def fetch_data():
@@ -41,9 +53,7 @@ def analyze_performance(funds_data, config=None):
     
     # Load config if not provided
     if config is None:
-        config_path = Path(__file__).parent.parent / "config" / "config.yaml"
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config(CONFIG_PATH)
     
     # Check which analyzers are enabled
     analyzer_flags = config.get('analysis', {}).get('analyzers', {})
@@ -79,11 +89,15 @@ def analyze_holdings(funds_data):
     return funds_data
 
 
-def generate_recommendations(funds_data):
+def generate_recommendations(funds_data, excel=True):
     """
     Generate investment recommendations using two methods:
     1. Pure returns-based ranking
     2. Comprehensive ranking (returns + risk metrics)
+    
+    Args:
+        funds_data: Dictionary mapping categories to enriched fund DataFrames
+        excel: Also write an Excel workbook with one sheet per method
     """
     print("\n" + "=" * 60)
     print("STEP 4: Generating Recommendations")
@@ -103,12 +117,9 @@ def generate_recommendations(funds_data):
     
     # Save returns-based recommendations
     returns_file = f"{output_dir}/recommendations_returns_based.csv"
-    returns_excel = f"{output_dir}/recommendations_returns_based.xlsx"
-    returns_recommendations.to_csv(returns_file, index=False)
-    returns_recommendations.to_excel(returns_excel, index=False)
+    save_recommendations_csv(returns_recommendations, returns_file)
     print(f"✓ Saved {len(returns_recommendations)} returns-based recommendations")
     print(f"  - CSV: {returns_file}")
-    print(f"  - Excel: {returns_excel}")
     
     # Method 2: Comprehensive recommendations
     print(f"\n--- Method 2: Comprehensive Recommendations (Top {top_n} - Returns + Risk) ---")
@@ -117,18 +128,21 @@ def generate_recommendations(funds_data):
     
     # Save comprehensive recommendations
     comprehensive_file = f"{output_dir}/recommendations_comprehensive.csv"
-    comprehensive_excel = f"{output_dir}/recommendations_comprehensive.xlsx"
-    comprehensive_recommendations.to_csv(comprehensive_file, index=False)
-    comprehensive_recommendations.to_excel(comprehensive_excel, index=False)
+    save_recommendations_csv(comprehensive_recommendations, comprehensive_file)
     print(f"✓ Saved {len(comprehensive_recommendations)} comprehensive recommendations")
     print(f"  - CSV: {comprehensive_file}")
-    print(f"  - Excel: {comprehensive_excel}")
     
-    # Also save combined file for backward compatibility
+    # Also save combined file for backward compatibility (same content: copy it)
     combined_file = f"{output_dir}/recommendations.csv"
+    shutil.copyfile(comprehensive_file, combined_file)
+    
+    # Both sets go into one workbook; comprehensive stays the first sheet so
+    # readers of the old single-sheet recommendations.xlsx get the same data
     combined_excel = f"{output_dir}/recommendations.xlsx"
-    comprehensive_recommendations.to_csv(combined_file, index=False)
-    comprehensive_recommendations.to_excel(combined_excel, index=False)
+    sheets = {'comprehensive': comprehensive_recommendations, 'returns_based': returns_recommendations}
+    if excel and save_recommendations_excel(sheets, combined_excel):
+        print(f"  - Excel: {combined_excel} (sheets: {', '.join(sheets)})")
+    save_recommendations_parquet(comprehensive_recommendations, f"{output_dir}/recommendations.parquet")
     
     return {
         'returns_based': returns_recommendations,
@@ -136,6 +150,77 @@ def generate_recommendations(funds_data):
     }
 
 
+def save_recommendations_csv(recommendations, csv_path):
+    """
+    Save recommendations as CSV, formatted by Arrow's C++ writer.
+    Arrow quotes the header and every string field (pandas' to_csv quoted only
+    when needed); numeric fields are unquoted and values round-trip unchanged.
+    
+    Args:
+        recommendations: Recommendations DataFrame
+        csv_path: Output .csv file
+    """
+    if not recommendations.empty:
+        try:
+            table = pa.Table.from_pandas(recommendations, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type columns Arrow cannot convert: let pandas write them
+            table = None
+        if table is not None:
+            pa_csv.write_csv(table, csv_path)
+            return
+    
+    recommendations.to_csv(csv_path, index=False)
+
+
+def save_recommendations_excel(sheets, excel_path):
+    """
+    Save recommendations as an Excel workbook with one sheet per DataFrame.
+    Rows are streamed with openpyxl's write-only mode instead of building the
+    whole workbook in memory first, as DataFrame.to_excel does.
+    
+    Args:
+        sheets: Mapping of sheet name to recommendations DataFrame (in sheet order)
+        excel_path: Output .xlsx file
+        
+    Returns:
+        True if the workbook was written, False when openpyxl is not installed
+    """
+    if not OPENPYXL_AVAILABLE:
+        print(f"  ⚠ Skipped {excel_path} (openpyxl not installed)")
+        return False
+    
+    workbook = Workbook(write_only=True)
+    for sheet_name, recommendations in sheets.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append([str(column) for column in recommendations.columns])
+        # Missing values become empty cells, as with to_excel
+        values = recommendations.astype(object).where(recommendations.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(excel_path)
+    return True
+
+
+def save_recommendations_parquet(recommendations, parquet_path):
+    """
+    Save recommendations as a Parquet dataset partitioned by category,
+    so viewers can read only the partitions and columns they need.
+    
+    Args:
+        recommendations: Recommendations DataFrame
+        parquet_path: Output dataset directory
+    """
+    # Partitioned writes add files to existing directories, so start clean
+    shutil.rmtree(parquet_path, ignore_errors=True)
+    
+    if recommendations.empty or 'category' not in recommendations.columns:
+        return
+    
+    recommendations.to_parquet(parquet_path, partition_cols=['category'], index=False)
+    print(f"  - Parquet: {parquet_path}")
+
+
 def display_recommendations(recommendations):
     """Display both sets of recommendations."""
     print("\n" + "=" * 60)
@@ -162,6 +247,7 @@ def main():
     parser.add_argument('--analyze', action='store_true', help='Analyze funds')
     parser.add_argument('--recommend', action='store_true', help='Generate recommendations')
     parser.add_argument('--all', action='store_true', help='Run all steps')
+    parser.add_argument('--no-excel', action='store_true', help='Skip the Excel copies of the reports')
     
     args = parser.parse_args()
     
@@ -178,18 +264,14 @@ def main():
         if not funds_data:
             print("No fund data available. Run with --fetch first.")
             return
-        # Load config
-        config_path = Path(__file__).parent.parent / "config" / "config.yaml"
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        funds_data = analyze_performance(funds_data, config=config)
+        funds_data = analyze_performance(funds_data, config=load_config(CONFIG_PATH))
         funds_data = analyze_holdings(funds_data)
     
     if args.all or args.recommend:
         if not funds_data:
             print("No fund data available. Run with --fetch first.")
             return
-        recommendations = generate_recommendations(funds_data)
+        recommendations = generate_recommendations(funds_data, excel=not args.no_excel)
         display_recommendations(recommendations)
 
 
@@ -0,0 +1,145 @@
+"""
+Ranking Kernels
+Score formulas over per-metric float64 arrays (one array per column).
+NaN marks a missing metric; a missing metric contributes nothing to a score.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _returns_loop(r1, r3, r5, w1, w3, w5):
+    """Weighted average of the available returns per fund, capped at 100."""
+    scores = np.empty(r1.size)
+    for i in range(r1.size):
+        score = 0.0
+        total_weight = 0.0
+        if not np.isnan(r1[i]):
+            score += r1[i] * w1
+            total_weight += w1
+        if not np.isnan(r3[i]):
+            score += r3[i] * w3
+            total_weight += w3
+        if not np.isnan(r5[i]):
+            score += r5[i] * w5
+            total_weight += w5
+        if total_weight > 0:
+            score = score / total_weight
+        scores[i] = min(score, 100.0)
+    return scores
+
+
+def _comprehensive_loop(r1, r3, r5, sharpe, consistency, std_dev, alpha, risk,
+                        w1, w3, w5, w_sharpe, w_consistency, w_alpha, w_risk):
+    """Returns, risk-adjusted, consistency, alpha and risk terms per fund, capped at 100."""
+    scores = np.empty(r1.size)
+    for i in range(r1.size):
+        score = 0.0
+        # NaN != 0 is True, so each term also checks for NaN explicitly
+        if r1[i] != 0 and not np.isnan(r1[i]):
+            score += (r1[i] / 100) * w1 * 100
+        if r3[i] != 0 and not np.isnan(r3[i]):
+            score += (r3[i] / 100) * w3 * 100
+        if r5[i] != 0 and not np.isnan(r5[i]):
+            score += (r5[i] / 100) * w5 * 100
+        if sharpe[i] != 0 and not np.isnan(sharpe[i]):
+            score += min(sharpe[i] / 2.0, 1.0) * w_sharpe * 100
+        if consistency[i] != 0 and not np.isnan(consistency[i]):
+            score += (consistency[i] / 100) * w_consistency * 100
+        elif std_dev[i] != 0 and not np.isnan(std_dev[i]):
+            score += max(0.0, 1 - (std_dev[i] / 30)) * w_consistency * 100
+        if alpha[i] != 0 and not np.isnan(alpha[i]):
+            score += min(1.0, max(0.0, (alpha[i] + 10) / 20)) * w_alpha * 100
+        if not np.isnan(risk[i]):
+            score += (1 - (risk[i] / 100)) * w_risk * 100
+        scores[i] = min(score, 100.0)
+    return scores
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: the NaN checks above must survive compilation. The loops are
+    # left serial since categories hold ~100 funds, too few for prange to pay off.
+    _returns_kernel = njit(cache=True, nogil=True)(_returns_loop)
+    _comprehensive_kernel = njit(cache=True, nogil=True)(_comprehensive_loop)
+
+
+def _is_set(values: np.ndarray) -> np.ndarray:
+    """Mask of metric values that are present and non-zero."""
+    return ~np.isnan(values) & (values != 0)
+
+
+def score_returns(r1: np.ndarray, r3: np.ndarray, r5: np.ndarray,
+                  w1: float, w3: float, w5: float) -> np.ndarray:
+    """
+    Calculate returns-based scores.
+    
+    Args:
+        r1, r3, r5: 1Y/3Y/5Y returns (NaN where missing)
+        w1, w3, w5: Weight of each return period
+    
+    Returns:
+        Array of returns-based scores (0-100)
+    """
+    if NUMBA_AVAILABLE:
+        return _returns_kernel(r1, r3, r5, w1, w3, w5)
+    
+    score = np.zeros(r1.size)
+    total_weight = np.zeros(r1.size)
+    for values, weight in ((r1, w1), (r3, w3), (r5, w5)):
+        present = ~np.isnan(values)
+        score += np.where(present, values * weight, 0.0)
+        total_weight += np.where(present, weight, 0.0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.where(total_weight > 0, score / total_weight, score)
+    return np.minimum(score, 100.0)
+
+
+def score_comprehensive(r1: np.ndarray, r3: np.ndarray, r5: np.ndarray,
+                        sharpe: np.ndarray, consistency: np.ndarray, std_dev: np.ndarray,
+                        alpha: np.ndarray, risk: np.ndarray,
+                        w1: float, w3: float, w5: float, w_sharpe: float,
+                        w_consistency: float, w_alpha: float, w_risk: float) -> np.ndarray:
+    """
+    Calculate comprehensive scores.
+    
+    Args:
+        r1, r3, r5: 1Y/3Y/5Y returns (NaN where missing)
+        sharpe, consistency, std_dev, alpha, risk: Risk metrics (NaN where missing)
+        w1 ... w_risk: Weight of each term
+    
+    Returns:
+        Array of comprehensive scores (0-100)
+    """
+    if NUMBA_AVAILABLE:
+        return _comprehensive_kernel(r1, r3, r5, sharpe, consistency, std_dev, alpha, risk,
+                                     w1, w3, w5, w_sharpe, w_consistency, w_alpha, w_risk)
+    
+    score = np.zeros(r1.size)
+    
+    # Returns-based scoring
+    for values, weight in ((r1, w1), (r3, w3), (r5, w5)):
+        score += np.where(_is_set(values), (values / 100) * weight * 100, 0.0)
+    
+    # Risk-adjusted returns
+    score += np.where(_is_set(sharpe), np.minimum(sharpe / 2.0, 1.0) * w_sharpe * 100, 0.0)
+    
+    # Consistency (dedicated score if available, else inverse std dev)
+    normalized_consistency = np.where(_is_set(consistency), consistency / 100,
+                                      np.maximum(0, 1 - (std_dev / 30)))
+    has_consistency = _is_set(consistency) | _is_set(std_dev)
+    score += np.where(has_consistency, normalized_consistency * w_consistency * 100, 0.0)
+    
+    # Benchmark outperformance (alpha scaled from -10% to +10%)
+    normalized_alpha = np.minimum(1.0, np.maximum(0, (alpha + 10) / 20))
+    score += np.where(_is_set(alpha), normalized_alpha * w_alpha * 100, 0.0)
+    
+    # Risk score (inverse - lower risk = higher score)
+    score += np.where(~np.isnan(risk), (1 - (risk / 100)) * w_risk * 100, 0.0)
+    
+    return np.minimum(score, 100.0)
@@ -9,23 +9,55 @@ Supports two ranking methods:
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
-import yaml
 import os
+import sys
+from pathlib import Path
+from ._kernels import score_returns, score_comprehensive
+
+# config_loader sits under src/, next to this package; make it importable
+# even when ranking was imported with only the project root on sys.path
+_SRC_DIR = str(Path(__file__).parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+from config_loader import load_config
+
+
+def _metric_values(funds_df: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a metric column as float64 (NaN where missing or absent)."""
+    if column not in funds_df.columns:
+        return np.full(len(funds_df), np.nan)
+    return pd.to_numeric(funds_df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
 
 
 class FundRanker:
     """Ranks funds and selects top performers using different strategies."""
     
+    # Report columns (in order) and the value used when a fund frame lacks one
+    RECOMMENDATION_COLUMNS = {
+        'fund_name': '',
+        'rank': 0,
+        'score': 0,
+        'returns_1y': 0,
+        'returns_3y': 0,
+        'returns_5y': 0,
+        'sharpe_ratio': 0,
+        'standard_deviation': 0,
+        'max_drawdown': 0,
+        'risk_score': 0,
+        'consistency_score': 0,
+        'alpha': 0,
+        'benchmark_name': 'N/A',
+    }
+    
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize the fund ranker with configuration."""
         self.config = self._load_config(config_path)
         self.weights = self.config.get('ranking_weights', {})
     
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file (parsed once per process unless the file changes)."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except FileNotFoundError:
             return {}
     
@@ -40,32 +72,7 @@ class FundRanker:
         Returns:
             Returns-based score (0-100)
         """
-        score = 0.0
-        total_weight = 0.0
-        
-        # Returns-based scoring only
-        # Weight: 1Y = 0.15, 3Y = 0.20, 5Y = 0.25 (total = 0.60)
-        if 'returns_1y' in fund_data and fund_data['returns_1y'] is not None:
-            weight = self.weights.get('returns_1y', 0.15)
-            score += fund_data['returns_1y'] * weight
-            total_weight += weight
-        
-        if 'returns_3y' in fund_data and fund_data['returns_3y'] is not None:
-            weight = self.weights.get('returns_3y', 0.20)
-            score += fund_data['returns_3y'] * weight
-            total_weight += weight
-        
-        if 'returns_5y' in fund_data and fund_data['returns_5y'] is not None:
-            weight = self.weights.get('returns_5y', 0.25)
-            score += fund_data['returns_5y'] * weight
-            total_weight += weight
-        
-        # Normalize by total weight to get weighted average
-        if total_weight > 0:
-            score = score / total_weight
-        
-        # Cap at 100 (for very high returns)
-        return min(score, 100.0)
+        return float(self.returns_scores(pd.DataFrame([fund_data]))[0])
     
     def calculate_comprehensive_score(self, fund_data: Dict) -> float:
         """
@@ -77,46 +84,57 @@ class FundRanker:
         Returns:
             Comprehensive score (0-100)
         """
-        score = 0.0
-        
-        # Returns-based scoring
-        if 'returns_1y' in fund_data and fund_data['returns_1y']:
-            score += (fund_data['returns_1y'] / 100) * self.weights.get('returns_1y', 0.15) * 100
-        
-        if 'returns_3y' in fund_data and fund_data['returns_3y']:
-            score += (fund_data['returns_3y'] / 100) * self.weights.get('returns_3y', 0.20) * 100
-        
-        if 'returns_5y' in fund_data and fund_data['returns_5y']:
-            score += (fund_data['returns_5y'] / 100) * self.weights.get('returns_5y', 0.25) * 100
-        
-        # Risk-adjusted returns
-        if 'sharpe_ratio' in fund_data and fund_data['sharpe_ratio']:
-            normalized_sharpe = min(fund_data['sharpe_ratio'] / 2.0, 1.0)  # Normalize to 0-1
-            score += normalized_sharpe * self.weights.get('sharpe_ratio', 0.20) * 100
-        
-        # Consistency (use dedicated consistency_score if available, else fall back to std dev)
-        if 'consistency_score' in fund_data and fund_data['consistency_score']:
-            # Use dedicated consistency score (0-100)
-            normalized_consistency = fund_data['consistency_score'] / 100
-            score += normalized_consistency * self.weights.get('consistency', 0.10) * 100
-        elif 'standard_deviation' in fund_data and fund_data['standard_deviation']:
-            # Fallback: Inverse relationship - lower std dev = higher score
-            normalized_consistency = max(0, 1 - (fund_data['standard_deviation'] / 30))
-            score += normalized_consistency * self.weights.get('consistency', 0.10) * 100
-        
-        # Benchmark outperformance (alpha)
-        if 'alpha' in fund_data and fund_data['alpha']:
-            # Positive alpha = outperformance, negative = underperformance
-            # Normalize: alpha of 5% = good, alpha of -5% = bad
-            normalized_alpha = min(1.0, max(0, (fund_data['alpha'] + 10) / 20))  # Scale -10% to +10%
-            score += normalized_alpha * self.weights.get('alpha', 0.05) * 100
+        return float(self.comprehensive_scores(pd.DataFrame([fund_data]))[0])
+    
+    def returns_scores(self, funds_df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate returns-based scores for every fund in one vectorized pass.
+        Missing returns are left out of the weighted average.
         
-        # Risk score (inverse - lower risk = higher score)
-        if 'risk_score' in fund_data:
-            risk_factor = 1 - (fund_data['risk_score'] / 100)
-            score += risk_factor * self.weights.get('risk_score', 0.10) * 100
+        Args:
+            funds_df: DataFrame with fund metrics
+            
+        Returns:
+            Array of returns-based scores (0-100), aligned with funds_df rows
+        """
+        return score_returns(
+            _metric_values(funds_df, 'returns_1y'),
+            _metric_values(funds_df, 'returns_3y'),
+            _metric_values(funds_df, 'returns_5y'),
+            # Weight: 1Y = 0.15, 3Y = 0.20, 5Y = 0.25 (total = 0.60)
+            self.weights.get('returns_1y', 0.15),
+            self.weights.get('returns_3y', 0.20),
+            self.weights.get('returns_5y', 0.25),
+        )
+    
+    def comprehensive_scores(self, funds_df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate comprehensive scores for every fund in one vectorized pass.
+        A missing (or zero) metric contributes nothing to the score.
         
-        return min(score, 100.0)  # Cap at 100
+        Args:
+            funds_df: DataFrame with fund metrics
+            
+        Returns:
+            Array of comprehensive scores (0-100), aligned with funds_df rows
+        """
+        return score_comprehensive(
+            _metric_values(funds_df, 'returns_1y'),
+            _metric_values(funds_df, 'returns_3y'),
+            _metric_values(funds_df, 'returns_5y'),
+            _metric_values(funds_df, 'sharpe_ratio'),
+            _metric_values(funds_df, 'consistency_score'),
+            _metric_values(funds_df, 'standard_deviation'),
+            _metric_values(funds_df, 'alpha'),
+            _metric_values(funds_df, 'risk_score'),
+            self.weights.get('returns_1y', 0.15),
+            self.weights.get('returns_3y', 0.20),
+            self.weights.get('returns_5y', 0.25),
+            self.weights.get('sharpe_ratio', 0.20),
+            self.weights.get('consistency', 0.10),
+            self.weights.get('alpha', 0.05),
+            self.weights.get('risk_score', 0.10),
+        )
     
     def rank_funds(self, funds_df: pd.DataFrame, method: str = 'comprehensive') -> pd.DataFrame:
         """
@@ -132,24 +150,15 @@ class FundRanker:
         if funds_df.empty:
             return funds_df
         
-        # Choose scoring method
+        # Score every fund at once with the chosen method
         if method == 'returns':
-            score_func = self.calculate_returns_score
+            scores = self.returns_scores(funds_df)
         else:
-            score_func = self.calculate_comprehensive_score
+            scores = self.comprehensive_scores(funds_df)
         
-        # Calculate scores for each fund
-        scores = []
-        for _, fund in funds_df.iterrows():
-            score = score_func(fund.to_dict())
-            scores.append(score)
-        
-        funds_df = funds_df.copy()
-        funds_df['score'] = scores
-        funds_df = funds_df.sort_values('score', ascending=False)
-        funds_df['rank'] = range(1, len(funds_df) + 1)
-        
-        return funds_df
+        # Order by descending score (ties keep input order) and gather rows once
+        order = np.argsort(-scores, kind='stable')
+        return funds_df.iloc[order].assign(score=scores[order], rank=np.arange(1, len(order) + 1))
     
     def select_top_funds(self, funds_by_category: Dict[str, pd.DataFrame], 
                         top_n: int = 3, method: str = 'comprehensive') -> Dict[str, pd.DataFrame]:
@@ -190,41 +199,21 @@ class FundRanker:
         Returns:
             DataFrame with recommendations
         """
-        all_recommendations = []
+        parts = []
         
         for category, funds_df in top_funds.items():
             if not funds_df.empty:
-                for _, fund in funds_df.iterrows():
-                    recommendation = {
-                        'category': category,
-                        'fund_name': fund.get('fund_name', ''),
-                        'rank': fund.get('rank', 0),
-                        'score': fund.get('score', 0),
-                        'returns_1y': fund.get('returns_1y', 0),
-                        'returns_3y': fund.get('returns_3y', 0),
-                        'returns_5y': fund.get('returns_5y', 0),
-                        'sharpe_ratio': fund.get('sharpe_ratio', 0),
-                        'standard_deviation': fund.get('standard_deviation', 0),
-                        'max_drawdown': fund.get('max_drawdown', 0),
-                        'risk_score': fund.get('risk_score', 0),
-                        # New metrics
-                        'consistency_score': fund.get('consistency_score', 0),
-                        'alpha': fund.get('alpha', 0),
-                        'benchmark_name': fund.get('benchmark_name', 'N/A'),
-                        'method': method
-                    }
-                    all_recommendations.append(recommendation)
-        
-        if all_recommendations:
-            recommendations_df = pd.DataFrame(all_recommendations)
-            # Sort by category and rank if columns exist
-            sort_columns = []
-            if 'category' in recommendations_df.columns:
-                sort_columns.append('category')
-            if 'rank' in recommendations_df.columns:
-                sort_columns.append('rank')
-            if sort_columns:
-                return recommendations_df.sort_values(sort_columns)
-            return recommendations_df
+                # Select the report columns as whole columns; absent ones get their default
+                columns = {
+                    column: funds_df[column] if column in funds_df.columns else default
+                    for column, default in self.RECOMMENDATION_COLUMNS.items()
+                }
+                parts.append(pd.DataFrame({'category': category, **columns, 'method': method},
+                                          index=funds_df.index))
+        
+        if parts:
+            recommendations_df = pd.concat(parts, ignore_index=True)
+            # Sort by category and rank
+            return recommendations_df.sort_values(['category', 'rank'])
         else:
             return pd.DataFrame()
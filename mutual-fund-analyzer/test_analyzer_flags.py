@@ -12,6 +12,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from data_fetcher import MFAPIFetcher, FundFetcher
+from ranking import FundRanker
 
 
 def test_analyzer_flags():
@@ -156,6 +157,12 @@ def test_config_loading():
         assert 'benchmark_analyzer' in analyzer_flags, "Should have benchmark_analyzer flag"
         assert 'holdings_analyzer' in analyzer_flags, "Should have holdings_analyzer flag"
         
+        # The ranker reuses the cached parse but gets its own copy of it
+        first, second = FundRanker(), FundRanker()
+        assert first.config == fetcher.config, "Ranker should load the same config"
+        first.weights['returns_1y'] = -1
+        assert second.weights.get('returns_1y') != -1, "Cached config should not be shared"
+        
         print("✓ Config loaded successfully")
         print(f"  performance_analyzer: {analyzer_flags.get('performance_analyzer')}")
         print(f"  consistency_analyzer: {analyzer_flags.get('consistency_analyzer')}")
@@ -27,7 +27,6 @@ def test_cache_manager_initialization():
         # Test with default directory
         cache = CacheManager()
         assert cache.cache_dir.exists(), "Cache directory should be created"
-        assert cache.metadata_dir.exists(), "Metadata directory should be created"
         assert cache.nav_data_dir.exists(), "NAV data directory should be created"
         assert cache.FRESHNESS_DAYS == 30, "Freshness should be 30 days"
         
@@ -63,13 +62,19 @@ def test_all_funds_caching():
             # Test save
             cache.save_all_funds(sample_funds)
             assert cache.get_all_funds_cache_path().exists(), "Cache file should exist"
-            assert cache.get_all_funds_metadata_path().exists(), "Metadata file should exist"
+            assert cache.get_cache_stats()['all_funds_cached'], "Timestamp should be stored with the data"
             
             # Test load
             loaded_funds = cache.load_all_funds()
             assert loaded_funds is not None, "Should load funds from cache"
             assert len(loaded_funds) == 3, "Should load all 3 funds"
             assert list(loaded_funds['schemeCode']) == [100001, 100002, 100003], "Data should match"
+            assert cache.get_all_funds_etag() is None, "No ETag should be stored by default"
+            
+            # ETag is kept with the data for conditional re-fetches
+            cache.save_all_funds(sample_funds, etag='"abc123"')
+            assert cache.get_all_funds_etag() == '"abc123"', "ETag should round-trip"
+            assert len(cache.load_all_funds()) == 3, "Data should still load"
             
             print("✓ SUCCESS: All funds caching works")
             print(f"  Saved: {len(sample_funds)} funds")
@@ -104,7 +109,7 @@ def test_nav_data_caching():
             # Test save
             cache.save_nav_data(scheme_code, sample_nav)
             assert cache.get_nav_cache_path(scheme_code).exists(), "NAV cache file should exist"
-            assert cache.get_nav_metadata_path(scheme_code).exists(), "NAV metadata should exist"
+            assert cache.get_cache_stats()['nav_data_cached_count'] == 1, "NAV partition should be counted"
             
             # Test load
             loaded_nav = cache.load_nav_data(scheme_code)
@@ -113,6 +118,27 @@ def test_nav_data_caching():
             assert 'date' in loaded_nav.columns, "Should have date column"
             assert 'nav' in loaded_nav.columns, "Should have nav column"
             
+            # Fetcher memoizes disk hits in-process: second lookup skips the disk
+            api = MFAPIFetcher()
+            api.cache_manager = cache
+            first = api.fetch_fund_history(scheme_code)
+            assert api.fetch_fund_history(scheme_code) is first, "Second lookup should hit the memo"
+            assert api.fetch_fund_histories([scheme_code])[scheme_code] is first, "Batch fetch should use the memo"
+            
+            # Incremental update: only NAVs from the last cached date are requested and merged
+            cached_nav = loaded_nav.assign(date=loaded_nav['date'].dt.normalize())  # API dates have no time
+            params = api._history_params(cached_nav)
+            last_day = cached_nav['date'].max()
+            assert params['startDate'] == last_day.strftime('%Y-%m-%d'), "Should start at last cached date"
+            payload = {'status': 'SUCCESS', 'data': [
+                {'date': (last_day + timedelta(days=1)).strftime('%d-%m-%Y'), 'nav': '200.0'},
+                {'date': last_day.strftime('%d-%m-%Y'), 'nav': '150.0'},
+            ]}
+            merged = api._parse_history_payload(payload, 3650, cached_nav)
+            assert len(merged) == 11, "Should append the one new NAV"
+            assert merged['date'].is_monotonic_increasing, "Merged history should be date-sorted"
+            assert merged['nav'].iloc[-2:].tolist() == [150.0, 200.0], "Restated NAV should replace the cached one"
+            
             print("✓ SUCCESS: NAV data caching works")
             print(f"  Saved: {len(sample_nav)} NAV records for scheme {scheme_code}")
             print(f"  Loaded: {len(loaded_nav)} NAV records")
@@ -182,16 +208,16 @@ def test_cache_expiration():
             loaded = cache.load_all_funds()
             assert loaded is not None, "Should load fresh data"
             
-            # Manually make metadata stale (31 days old)
-            metadata_path = cache.get_all_funds_metadata_path()
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            # Manually make the stored timestamp stale (31 days old)
+            import pyarrow.parquet as pq
+            cache_path = cache.get_all_funds_cache_path()
+            table = pq.read_table(cache_path)
+            metadata = dict(table.schema.metadata)
             
             stale_date = datetime.now() - timedelta(days=31)
-            metadata['timestamp'] = stale_date.isoformat()
+            metadata[b'timestamp'] = stale_date.isoformat().encode()
             
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f)
+            pq.write_table(table.replace_schema_metadata(metadata), cache_path)
             
             # Should not load stale data
             stale_loaded = cache.load_all_funds()
@@ -341,7 +367,6 @@ def main():
 
 
 if __name__ == "__main__":
-    import json  # For test_cache_expiration
     success = main()
     sys.exit(0 if success else 1)
 
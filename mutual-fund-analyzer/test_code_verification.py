@@ -44,6 +44,26 @@ def test_fund_categorization():
     
     try:
         api = MFAPIFetcher(rate_limit=0.5)
+        
+        # Vectorized classification agrees with per-name classification
+        names = pd.Series(['HDFC Small Cap Fund', 'UTI Nifty Index Fund', 'SBI Banking ETF', 'Axis Flexi Cap Fund'])
+        expected = [api.classify_fund_category(name) for name in names]
+        assert list(api._classify_all(names)) == expected, "Vectorized classification should match"
+        assert list(api._classify_all(names)) == expected, "Memoized re-classification should match"
+        
+        # Only Direct Plan growth schemes are kept, labelled with a categorical dtype
+        sample = pd.DataFrame({
+            'schemeCode': [1, 2, 3],
+            'schemeName': ['HDFC Small Cap Fund - Direct Plan - Growth',
+                           'HDFC Small Cap Fund - Direct Plan - IDCW',
+                           'UTI Nifty Index Fund - Regular Plan - Growth']
+        })
+        sample_categorized = api.categorize_funds(sample)
+        assert sample_categorized['smallcap']['schemeCode'].tolist() == [1], "Should keep only the Direct growth plan"
+        assert isinstance(sample_categorized['smallcap']['category'].dtype, pd.CategoricalDtype), \
+            "Category should be categorical"
+        assert sample_categorized['index_funds'].empty, "Regular plans should be dropped"
+        
         all_funds = api.fetch_all_funds()
         
         if all_funds.empty:
@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from analyzer import ConsistencyAnalyzer, BenchmarkAnalyzer
+from analyzer import ConsistencyAnalyzer, BenchmarkAnalyzer, FundContext
 from data_fetcher import MFAPIFetcher
 
 
@@ -34,6 +34,25 @@ def test_consistency_analyzer():
         assert 'rolling_consistency' in metrics, "Should have rolling_consistency"
         assert 'coefficient_of_variation' in metrics, "Should have coefficient_of_variation"
         
+        # Batch analysis over a long DataFrame matches the single-fund results
+        volatile_navs = [100 + x*2 + (5 if x % 2 else -5) for x in range(24)]
+        long_history = pd.concat([
+            nav_history.assign(fund_id='steady'),
+            pd.DataFrame({'date': dates, 'nav': volatile_navs, 'fund_id': 'volatile'})
+        ])
+        batch = analyzer.analyze_funds_consistency(long_history)
+        assert list(batch.index) == ['steady', 'volatile'], "Should have one row per fund"
+        for key, value in metrics.items():
+            assert np.isclose(batch.loc['steady', key], value), f"Batch {key} should match single-fund result"
+        assert batch.loc['volatile', 'consistency_score'] < batch.loc['steady', 'consistency_score'], \
+            "Volatile fund should be less consistent"
+        
+        # A shared FundContext gives the same metrics without re-deriving returns
+        ctx = FundContext.from_nav(nav_history)
+        ctx_metrics = analyzer.analyze_fund_consistency(nav_history, ctx=ctx)
+        for key, value in metrics.items():
+            assert np.isclose(ctx_metrics[key], value), f"Context {key} should match"
+        
         print(f"✓ SUCCESS: Consistency metrics calculated")
         print(f"  Consistency Score: {metrics['consistency_score']:.2f}")
         print(f"  Rolling Consistency: {metrics['rolling_consistency']:.2f}")
@@ -62,6 +81,15 @@ def test_benchmark_analyzer():
         benchmark = analyzer.identify_benchmark('Nippon Small Cap Fund', 'smallcap')
         assert benchmark == 'NIFTY Smallcap 100', f"Expected NIFTY Smallcap 100, got {benchmark}"
         
+        # Overlapping keywords: the earliest keyword in BENCHMARK_MAPPING wins
+        benchmark = analyzer.identify_benchmark('HDFC BSE Sensex Index Fund', 'index_funds')
+        assert benchmark == 'S&P BSE SENSEX', f"Expected S&P BSE SENSEX, got {benchmark}"
+        
+        # Tracking error against a synthetic benchmark
+        benchmark_returns = pd.Series([1.0, -2.0, 3.0, 0.5, -1.0, 2.0])
+        tracking_error = analyzer.calculate_tracking_error(benchmark_returns, benchmark_returns)
+        assert tracking_error == 0.0, f"Expected zero tracking error, got {tracking_error}"
+        
         # Test benchmark metrics calculation
         dates = [datetime.now() - timedelta(days=x*30) for x in range(24, 0, -1)]
         navs = [100 + x*2 for x in range(24)]